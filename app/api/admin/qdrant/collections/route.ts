@@ -4,36 +4,36 @@
  */
 
 import { NextResponse } from 'next/server';
-import { getQdrantService } from '../../../../../lib/vector/qdrant-service';
+import { getQdrantService, QdrantServiceError, QdrantUnavailableError } from '../../../../../lib/vector/qdrant-service';
 
 // Force Node.js runtime for Prisma compatibility
 export const runtime = 'nodejs';
 
+// Resolve the shared service once per module instead of on every request
+const qdrant = getQdrantService();
+
 export async function GET() {
     try {
-        const qdrant = getQdrantService();
-
-        // Get all collections info
-        const collectionsInfo = await qdrant.getAllCollectionsInfo();
-
-        // Convert to array format for easier handling
-        const collections = Object.entries(collectionsInfo).map(([name, info]) => ({
-            name,
-            vectorsCount: info.vectorsCount,
-            indexedVectorsCount: info.indexedVectorsCount,
-            pointsCount: info.pointsCount,
-            segmentsCount: info.segmentsCount,
-            status: info.status,
-            optimizerStatus: info.optimizerStatus
-        }));
+        // The service already returns the list in response shape
+        const collections = await qdrant.listCollectionsInfo();
 
         return NextResponse.json(collections);
 
     } catch (error) {
-        console.error('Failed to fetch collections:', error);
-        return NextResponse.json(
-            { error: 'Failed to fetch collections' },
-            { status: 500 }
-        );
+        if (error instanceof QdrantUnavailableError) {
+            return NextResponse.json(
+                { error: 'Vector database unavailable' },
+                { status: 503 }
+            );
+        }
+        if (error instanceof QdrantServiceError) {
+            console.error('Failed to fetch collections:', error.message);
+            return NextResponse.json(
+                { error: 'Failed to fetch collections' },
+                { status: 500 }
+            );
+        }
+        // Anything else is a bug; let it surface with its stack trace
+        throw error;
     }
 }
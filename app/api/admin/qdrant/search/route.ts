@@ -7,69 +7,48 @@ import { NextRequest, NextResponse } from 'next/server';
 
 // Force Node.js runtime for Prisma compatibility
 export const runtime = 'nodejs';
-import { getQdrantService } from '../../../../../lib/vector/qdrant-service';
+import { adminSearchRequestSchema, runAdminSearch } from '../../../../../lib/vector/admin-search';
+import { QdrantServiceError, QdrantUnavailableError } from '../../../../../lib/vector/qdrant-service';
 
 export async function POST(req: NextRequest) {
     try {
-        const { query, collection, limit = 10 } = await req.json();
+        const parsed = adminSearchRequestSchema.safeParse(await req.json().catch(() => null));
 
-        if (!query) {
+        if (!parsed.success) {
             return NextResponse.json(
-                { error: 'Query is required' },
+                { error: 'Invalid search request', details: parsed.error.flatten().fieldErrors },
                 { status: 400 }
             );
         }
 
-        const qdrant = getQdrantService();
+        const { query, collection } = parsed.data;
+        const results = await runAdminSearch(parsed.data);
 
-        // Generate a mock embedding for the query
-        // In production, you'd use OpenAI embeddings API
-        const mockEmbedding = Array.from({ length: 1536 }, () => Math.random() - 0.5);
-
-        let results = [];
-
-        if (collection === 'knowledge') {
-            results = await qdrant.searchKnowledge(mockEmbedding, {
-                limit,
-                scoreThreshold: 0.5
-            });
-        } else if (collection === 'sessions') {
-            results = await qdrant.searchSessions(mockEmbedding, 'admin-user', {
-                limit,
-                scoreThreshold: 0.5
-            });
-        } else if (collection === 'documents') {
-            results = await qdrant.searchDocuments(mockEmbedding, 'admin-user', {
-                limit,
-                scoreThreshold: 0.5
-            });
-        } else if (collection === 'files') {
-            results = await qdrant.searchFiles(mockEmbedding, 'admin-session', {
-                limit,
-                scoreThreshold: 0.5
-            });
-        } else {
+        if (!results) {
             return NextResponse.json(
                 { error: 'Invalid collection name' },
                 { status: 400 }
             );
         }
 
-        return NextResponse.json({
-            query,
-            collection,
-            results: results.map(result => ({
-                id: result.id,
-                score: result.score,
-                payload: result.payload
-            }))
-        });
+        // Results already have the { id, score, payload } response shape, so serialize them as-is
+        return NextResponse.json({ query, collection, results });
 
     } catch (error) {
-        console.error('Vector search failed:', error);
-        return NextResponse.json(
-            { error: 'Search failed' },
-            { status: 500 }
-        );
+        if (error instanceof QdrantUnavailableError) {
+            return NextResponse.json(
+                { error: 'Vector database unavailable' },
+                { status: 503 }
+            );
+        }
+        if (error instanceof QdrantServiceError) {
+            console.error('Vector search failed:', error.message);
+            return NextResponse.json(
+                { error: 'Search failed' },
+                { status: 500 }
+            );
+        }
+        // Anything else is a bug; let it surface with its stack trace
+        throw error;
     }
 }
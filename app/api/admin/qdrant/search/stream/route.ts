@@ -0,0 +1,71 @@
+/**
+ * Qdrant Vector Search Stream API
+ * Streams search results as newline-delimited JSON, one result per line
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+
+// Force Node.js runtime for Prisma compatibility
+export const runtime = 'nodejs';
+import { adminSearchRequestSchema, runAdminSearch } from '../../../../../../lib/vector/admin-search';
+import { QdrantServiceError, QdrantUnavailableError } from '../../../../../../lib/vector/qdrant-service';
+
+export async function POST(req: NextRequest) {
+    try {
+        const parsed = adminSearchRequestSchema.safeParse(await req.json().catch(() => null));
+
+        if (!parsed.success) {
+            return NextResponse.json(
+                { error: 'Invalid search request', details: parsed.error.flatten().fieldErrors },
+                { status: 400 }
+            );
+        }
+
+        const results = await runAdminSearch(parsed.data);
+
+        if (!results) {
+            return NextResponse.json(
+                { error: 'Invalid collection name' },
+                { status: 400 }
+            );
+        }
+
+        // Encode lazily as the client reads, so only one serialized row is held at a time
+        const encoder = new TextEncoder();
+        let index = 0;
+
+        const stream = new ReadableStream<Uint8Array>({
+            pull(controller) {
+                if (index >= results.length) {
+                    controller.close();
+                    return;
+                }
+                controller.enqueue(encoder.encode(JSON.stringify(results[index++]) + '\n'));
+            }
+        });
+
+        return new Response(stream, {
+            headers: {
+                'Content-Type': 'application/x-ndjson',
+                'Cache-Control': 'no-cache'
+            }
+        });
+
+    } catch (error) {
+        if (error instanceof QdrantUnavailableError) {
+            return NextResponse.json(
+                { error: 'Vector database unavailable' },
+                { status: 503 }
+            );
+        }
+        if (error instanceof QdrantServiceError) {
+            console.error('Vector search stream failed:', error.message);
+            return NextResponse.json(
+                { error: 'Search failed' },
+                { status: 500 }
+            );
+        }
+        // Anything else is a bug; let it surface with its stack trace
+        throw error;
+    }
+}
@@ -3,44 +3,113 @@
  * Enhanced chat endpoint with multi-model reasoning, RAG, and medical focus
  */
 
-import { NextRequest, NextResponse } from 'next/server';
+import { NextRequest, NextResponse, after } from 'next/server';
 
 // Force Node.js runtime for Prisma compatibility
 export const runtime = 'nodejs';
 import { StreamingTextResponse } from 'ai';
-import { PrismaClient } from '@prisma/client';
+import { z } from 'zod';
+import { Prisma } from '@prisma/client';
+import { getPrismaClient } from '../../../../lib/db/prisma';
+import { uuidv7 } from '../../../../lib/db/ids';
 import { doctorGPTWorkflow } from '../../../../lib/workflows/doctor-gpt-workflow';
+import { getMedicalDataService } from '../../../../lib/medical/medical-data-service';
+import { modelRepository } from '../../../../lib/models/repository';
 import { costTracker } from '../../../../lib/cost-tracking/tracker';
 import { config } from '../../../../config';
-import { DoctorGPTState } from '../../../../lib/workflows/types';
+import { DoctorGPTState, UploadedDocument } from '../../../../lib/workflows/types';
+import { WorkflowResultCache, workflowResultCache } from '../../../../lib/workflows/result-cache';
 import { MedicalContext } from '../../../../lib/models/types';
+import { MedicalQueryResponse } from '../../../../lib/medical/types';
 import { Operation } from '../../../../lib/cost-tracking/types';
 
-// Initialize Prisma client
-const prisma = new PrismaClient();
-
-interface ChatRequest {
-    messages: Array<{
-        role: 'user' | 'assistant' | 'system';
-        content: string;
-        id?: string;
-    }>;
-    userId?: string;
-    sessionId?: string;
-    medicalContext?: MedicalContext;
-    uploadedDocuments?: Array<{
-        id: string;
-        fileName: string;
-        content: string;
-    }>;
-    show_intermediate_steps?: boolean;
-    options?: {
-        enableMultiModel?: boolean;
-        enableWebSearch?: boolean;
-        enableCitations?: boolean;
-        maxCost?: number;
-    };
-}
+// Shared Prisma client, reusing the process-wide connection pool
+const prisma = getPrismaClient();
+
+// Resolve shared services once per module instead of on every request
+const medicalService = getMedicalDataService(prisma);
+
+// Words per streamed chunk
+const STREAM_CHUNK_WORDS = 16;
+
+// Minimum query length, in words, before a document-less turn runs the knowledge query
+const MIN_KNOWLEDGE_QUERY_WORDS = 4;
+
+// Whether error responses carry the underlying message; bound once since configuration is fixed after startup
+const EXPOSE_ERROR_DETAILS = config.isDevelopment;
+
+// Fixed response strings, shared by every request
+const DEFAULT_ERROR_RESPONSE = 'I apologize, but I encountered an issue processing your request. Please try again or rephrase your question.';
+const DEFAULT_MEDICAL_DISCLAIMER = '⚠️ This information is for educational purposes only and is not a substitute for professional medical advice.';
+const NON_MEDICAL_SYSTEM_PROMPT = 'You are a helpful assistant. If asked about medical topics, politely redirect to seek professional medical advice.';
+const NON_MEDICAL_DISCLAIMER = 'For medical questions, please consult with a healthcare professional.';
+const FALLBACK_ASSISTANT_RESPONSE = 'I apologize, but I encountered a technical issue while processing your request. Please try asking your question again.';
+
+// Keywords that route a query through the medical workflow
+const MEDICAL_KEYWORDS = [
+    'symptom', 'symptoms', 'pain', 'hurt', 'ache', 'fever', 'temperature',
+    'medication', 'medicine', 'drug', 'prescription', 'dosage',
+    'doctor', 'physician', 'hospital', 'clinic', 'medical',
+    'diagnosis', 'treatment', 'therapy', 'surgery', 'operation',
+    'health', 'wellness', 'sick', 'illness', 'disease', 'condition',
+    'blood', 'pressure', 'heart', 'lung', 'kidney', 'liver',
+    'diabetes', 'cancer', 'covid', 'flu', 'infection',
+    'allergy', 'allergic', 'reaction', 'side effect',
+    'test', 'lab', 'laboratory', 'x-ray', 'scan', 'mri', 'ct',
+    'vaccine', 'vaccination', 'immunization',
+    // Document analysis keywords
+    'document', 'pdf', 'report', 'uploaded', 'file', 'analyze', 'analysis',
+    'information', 'content', 'data', 'results', 'findings'
+];
+
+// Compiled once into a single case-insensitive alternation, so each query is scanned in one pass
+// rather than once per keyword; matching stays substring-based like the original includes() check
+const MEDICAL_KEYWORD_PATTERN = new RegExp(
+    MEDICAL_KEYWORDS.map(keyword => keyword.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|'),
+    'i'
+);
+
+// Parse and normalize the client payload in a single pass; document text arrives as either
+// `content` or `extractedText` depending on the uploader, so resolve it here once and emit
+// documents already in workflow shape
+const chatRequestSchema = z.object({
+    // Messages are echoed back for intermediate steps, so keep any extra client fields
+    messages: z.array(z.object({
+        role: z.string(),
+        content: z.string(),
+        id: z.string().optional()
+    }).passthrough()).min(1),
+    userId: z.string().optional(),
+    sessionId: z.string().optional(),
+    medicalContext: z.custom<MedicalContext>(value => typeof value === 'object' && value !== null).optional(),
+    uploadedDocuments: z.array(z.object({
+        id: z.string(),
+        fileName: z.string(),
+        fileType: z.string().optional(),
+        reportType: z.string().optional(),
+        content: z.string().optional(),
+        extractedText: z.string().optional()
+    }).transform((doc): UploadedDocument => {
+        const text = doc.content || doc.extractedText || '';
+        return {
+            id: doc.id,
+            fileName: doc.fileName,
+            fileType: doc.fileType || 'unknown',
+            content: text,
+            extractedText: text,
+            reportType: doc.reportType,
+            processingStatus: 'completed'
+        };
+    })).optional(),
+    show_intermediate_steps: z.boolean().optional(),
+    options: z.object({
+        enableMultiModel: z.boolean().optional(),
+        enableWebSearch: z.boolean().optional(),
+        enableCitations: z.boolean().optional(),
+        maxCost: z.number().optional(),
+        stream: z.boolean().optional()
+    }).optional()
+});
 
 interface ChatResponse {
     response: string;
@@ -61,26 +130,29 @@ interface ChatResponse {
         modelProviders: string[];
         responseTime: number;
         workflowExecuted: boolean;
+        cached?: boolean;
+        originalCost?: number;
         hasUploadedDocuments?: boolean;
         documentsUsed?: string[];
     };
 }
 
 export async function POST(req: NextRequest) {
-    const startTime = Date.now();
+    // Monotonic clock: unaffected by wall-clock adjustments mid-request
+    const startTime = performance.now();
 
     try {
-        const body = await req.json() as ChatRequest;
-        const { messages, userId, sessionId, medicalContext, uploadedDocuments, show_intermediate_steps, options } = body;
+        const parsed = chatRequestSchema.safeParse(await req.json().catch(() => null));
 
-        // Validate required fields
-        if (!messages || messages.length === 0) {
+        if (!parsed.success) {
             return NextResponse.json(
-                { error: 'Messages are required' },
+                { error: 'Invalid chat request', details: parsed.error.flatten().fieldErrors },
                 { status: 400 }
             );
         }
 
+        const { messages, userId, sessionId, medicalContext, uploadedDocuments, show_intermediate_steps, options } = parsed.data;
+
         const currentMessage = messages[messages.length - 1];
         if (currentMessage.role !== 'user') {
             return NextResponse.json(
@@ -92,15 +164,17 @@ export async function POST(req: NextRequest) {
         // Generate IDs if not provided
         const actualUserId = userId || crypto.randomUUID();
         const actualSessionId = sessionId || crypto.randomUUID();
-        const chatId = crypto.randomUUID();
+        const chatId = uuidv7();
 
         // Check if this is a medical query or if there are uploaded documents
-        const isMedicalQuery = await isMedicalRelated(currentMessage.content);
-        const hasUploadedDocuments = uploadedDocuments && uploadedDocuments.length > 0;
+        const isMedicalQuery = isMedicalRelated(currentMessage.content);
+        // Resolve the document list once; every later check and projection reads from it
+        const documents = uploadedDocuments ?? [];
+        const hasUploadedDocuments = documents.length > 0;
 
         if (!isMedicalQuery && !hasUploadedDocuments) {
             // Handle non-medical queries with simple model response
-            return handleNonMedicalQuery(currentMessage.content, actualUserId, actualSessionId, chatId);
+            return handleNonMedicalQuery(currentMessage.content, actualUserId, actualSessionId, chatId, startTime);
         }
 
         // Create workflow state
@@ -110,74 +184,92 @@ export async function POST(req: NextRequest) {
             sessionId: actualSessionId,
             chatId,
             medicalContext,
-            uploadedDocuments: uploadedDocuments?.map(doc => ({
-                id: doc.id,
-                fileName: doc.fileName,
-                fileType: 'unknown',
-                content: doc.content,
-                extractedText: doc.content,
-                processingStatus: 'completed' as const
-            }))
+            uploadedDocuments
         };
 
-        console.log('Executing Doctor GPT workflow for user:', actualUserId);
-
-        // Execute the workflow with medical data service integration
-        const { getMedicalDataService } = await import('../../../../lib/medical/medical-data-service');
-        const medicalService = getMedicalDataService(prisma);
+        // The session upsert is independent of everything below; it is awaited before the result is used
+        const sessionReady = ensureChatSession(actualUserId, actualSessionId, currentMessage.content);
 
-        // Create chat record first to ensure chatId exists for cost tracking
-        await createInitialChatRecord(actualUserId, actualSessionId, chatId, currentMessage.content);
+        // Resolve report text first: the lookup is scoped to this user, and the cache key hashes the text it resolves
+        await loadMissingDocumentText(documents, actualUserId);
 
-        // Query medical knowledge using dual RAG with uploaded documents
-        console.log(`Querying medical knowledge with ${uploadedDocuments?.length || 0} uploaded documents`);
-
-        const medicalQuery = await medicalService.queryMedicalKnowledge({
+        // Repeated questions from the same user over the same documents and context reuse the earlier workflow result
+        const cacheKey = WorkflowResultCache.key({
             query: currentMessage.content,
             userId: actualUserId,
-            sessionId: actualSessionId,
-            useGlobalKnowledge: true,
-            useSessionDocuments: uploadedDocuments && uploadedDocuments.length > 0,
-            medicalContext: medicalContext,
-            uploadedDocuments: uploadedDocuments // Pass the actual documents
+            documents,
+            medicalContext
         });
+        const cachedResult = workflowResultCache.get(cacheKey);
+        let result: DoctorGPTState;
+
+        if (cachedResult) {
+            console.log('Serving cached Doctor GPT workflow result for user:', actualUserId);
+            await sessionReady;
+            // Re-stamp the per-request fields so the reused result belongs to this turn
+            result = {
+                ...cachedResult,
+                userQuery: currentMessage.content,
+                userId: actualUserId,
+                sessionId: actualSessionId,
+                chatId,
+                uploadedDocuments
+            };
+        } else {
+            console.log('Executing Doctor GPT workflow for user:', actualUserId);
+
+            // Short follow-ups with nothing attached (thanks, ok, what else?) gain nothing from a fresh
+            // dual-RAG pass; the workflow still runs its own retrieval node
+            const needsKnowledgeQuery = hasUploadedDocuments ||
+                currentMessage.content.trim().split(/\s+/).length >= MIN_KNOWLEDGE_QUERY_WORDS;
+
+            let knowledgeQuery: Promise<MedicalQueryResponse> | undefined;
+            if (needsKnowledgeQuery) {
+                // Query medical knowledge using dual RAG with uploaded documents
+                console.log(`Querying medical knowledge with ${documents.length} uploaded documents`);
+                knowledgeQuery = medicalService.queryMedicalKnowledge({
+                    query: currentMessage.content,
+                    userId: actualUserId,
+                    sessionId: actualSessionId,
+                    useGlobalKnowledge: true,
+                    useSessionDocuments: hasUploadedDocuments,
+                    medicalContext: medicalContext,
+                    uploadedDocuments: uploadedDocuments // Pass the actual documents
+                });
+            }
 
-        // Execute the workflow with medical context
-        const result = await doctorGPTWorkflow.execute({
-            ...workflowState,
-            medicalQueryResult: medicalQuery
-        });
+            // The session upsert and the knowledge query are independent, so they run concurrently
+            const [, medicalQuery] = await Promise.all([sessionReady, knowledgeQuery]);
+
+            // Execute the workflow with medical context
+            result = await doctorGPTWorkflow.execute({
+                ...workflowState,
+                medicalQueryResult: medicalQuery
+            });
 
-        // Update chat record with final response
-        await updateChatWithResponse(actualUserId, actualSessionId, chatId, result);
+            if (result.finalResponse?.content) {
+                workflowResultCache.set(cacheKey, result);
+            }
+        }
+
+        // Walk the model responses once for everything the response and chat record need
+        const modelSummary = summarizeModelResponses(result.modelResponses);
+
+        // A cached result costs nothing to serve again; its original spend is reported separately
+        const servedFromCache = cachedResult !== undefined;
+        const usage: ExchangeUsage = {
+            totalCost: servedFromCache ? 0 : result.metadata?.totalWorkflowCost || 0,
+            responseTime: Math.round(performance.now() - startTime),
+            originalCost: servedFromCache ? result.metadata?.totalWorkflowCost || 0 : undefined
+        };
 
         // Prepare response with improved content handling
         const responseContent = result.finalResponse?.content ||
-            result.modelResponses?.[0]?.response?.content ||
-            'I apologize, but I encountered an issue processing your request. Please try again or rephrase your question.';
+            modelSummary.firstContent ||
+            DEFAULT_ERROR_RESPONSE;
 
-        const response: ChatResponse = {
-            response: responseContent,
-            citations: result.citations || [],
-            confidence: result.confidence || 0.5,
-            medicalDisclaimer: result.finalResponse?.medicalDisclaimer ||
-                "⚠️ This information is for educational purposes only and is not a substitute for professional medical advice.",
-            cost: {
-                totalCost: result.metadata?.totalWorkflowCost || 0,
-                breakdown: {
-                    models: result.modelResponses?.reduce((sum, r) => sum + r.cost, 0) || 0,
-                    search: 0.001, // Approximate search cost
-                    workflow: 0.001 // Base workflow cost
-                }
-            },
-            metadata: {
-                modelProviders: result.modelResponses?.map(r => r.provider) || [],
-                responseTime: Date.now() - startTime,
-                workflowExecuted: true,
-                hasUploadedDocuments: (uploadedDocuments?.length || 0) > 0,
-                documentsUsed: uploadedDocuments?.map(doc => doc.fileName) || []
-            }
-        };
+        // Persist both sides of the exchange in one round-trip, after the response has been sent
+        after(() => saveChatExchange(actualUserId, actualSessionId, chatId, currentMessage.content, responseContent, modelSummary.providers, result, usage));
 
         // Handle intermediate steps response format
         if (show_intermediate_steps) {
@@ -187,7 +279,7 @@ export async function POST(req: NextRequest) {
                 {
                     id: 'assistant-response',
                     role: 'assistant' as const,
-                    content: response.response,
+                    content: responseContent,
                     tool_calls: undefined
                 }
             ];
@@ -195,9 +287,36 @@ export async function POST(req: NextRequest) {
             return NextResponse.json({ messages: responseMessages });
         }
 
-        // For streaming support, we'll return the complete response
-        // In production, this could be enhanced to stream chunks
-        if (options?.enableWebSearch !== false) {
+        // Server-built from workflow output, so the response is assembled directly without re-validation
+        const response: ChatResponse = {
+            response: responseContent,
+            citations: result.citations || [],
+            confidence: result.confidence || 0.5,
+            medicalDisclaimer: result.finalResponse?.medicalDisclaimer ||
+                DEFAULT_MEDICAL_DISCLAIMER,
+            cost: {
+                totalCost: usage.totalCost,
+                breakdown: servedFromCache
+                    ? { models: 0, search: 0, workflow: 0 }
+                    : {
+                        models: modelSummary.totalCost,
+                        search: 0.001, // Approximate search cost
+                        workflow: 0.001 // Base workflow cost
+                    }
+            },
+            metadata: {
+                modelProviders: modelSummary.providers,
+                responseTime: usage.responseTime,
+                workflowExecuted: true,
+                cached: servedFromCache,
+                originalCost: usage.originalCost,
+                hasUploadedDocuments,
+                documentsUsed: documents.map(doc => doc.fileName)
+            }
+        };
+
+        // Return the complete response unless the client opts into streaming
+        if (!options?.stream && options?.enableWebSearch !== false) {
             return NextResponse.json(response);
         }
 
@@ -216,31 +335,28 @@ export async function POST(req: NextRequest) {
     } catch (error) {
         console.error('Doctor GPT API error:', error);
 
-        // Track error cost
+        // Track error cost once the error response has been sent
         if (error instanceof Error) {
-            try {
-                await costTracker.trackCost({
-                    userId: 'unknown',
-                    operation: Operation.CHAT_COMPLETION,
-                    provider: 'error',
-                    inputCost: 0,
-                    outputCost: 0.001, // Small error cost
-                    totalCost: 0.001,
-                    currency: 'USD',
-                    metadata: {
-                        error: error.message,
-                        endpoint: '/api/chat/doctor-gpt'
-                    }
-                });
-            } catch (costError) {
-                console.error('Failed to track error cost:', costError);
-            }
+            const message = error.message;
+            after(() => costTracker.trackCost({
+                userId: 'unknown',
+                operation: Operation.CHAT_COMPLETION,
+                provider: 'error',
+                inputCost: 0,
+                outputCost: 0.001, // Small error cost
+                totalCost: 0.001,
+                currency: 'USD',
+                metadata: {
+                    error: message,
+                    endpoint: '/api/chat/doctor-gpt'
+                }
+            }).catch(costError => console.error('Failed to track error cost:', costError)));
         }
 
         return NextResponse.json(
             {
                 error: 'Failed to process medical query',
-                details: config.isDevelopment ? (error instanceof Error ? error.message : 'Unknown error') : undefined
+                details: EXPOSE_ERROR_DETAILS ? (error instanceof Error ? error.message : 'Unknown error') : undefined
             },
             { status: 500 }
         );
@@ -254,17 +370,16 @@ async function handleNonMedicalQuery(
     query: string,
     userId: string,
     sessionId: string,
-    chatId: string
+    chatId: string,
+    startTime: number
 ): Promise<NextResponse> {
     try {
-        const { modelRepository } = await import('../../../../lib/models/repository');
-
         const response = await modelRepository.complete(
             'openai',
             [
                 {
                     role: 'system',
-                    content: 'You are a helpful assistant. If asked about medical topics, politely redirect to seek professional medical advice.'
+                    content: NON_MEDICAL_SYSTEM_PROMPT
                 },
                 {
                     role: 'user',
@@ -273,8 +388,8 @@ async function handleNonMedicalQuery(
             ]
         );
 
-        // Track cost for non-medical query
-        await costTracker.trackCost({
+        // Track cost for non-medical query once the response has been sent
+        after(() => costTracker.trackCost({
             userId,
             sessionId,
             chatId,
@@ -292,12 +407,12 @@ async function handleNonMedicalQuery(
                 model: 'gpt-4o-mini',
                 provider: 'openai'
             }
-        });
+        }).catch(costError => console.error('Failed to track non-medical query cost:', costError)));
 
         const chatResponse: ChatResponse = {
             response: response.content,
             confidence: 0.8,
-            medicalDisclaimer: "For medical questions, please consult with a healthcare professional.",
+            medicalDisclaimer: NON_MEDICAL_DISCLAIMER,
             cost: {
                 totalCost: response.usage.totalTokens * 0.00000075, // Average cost
                 breakdown: {
@@ -308,7 +423,7 @@ async function handleNonMedicalQuery(
             },
             metadata: {
                 modelProviders: ['openai'],
-                responseTime: Date.now() - Date.now(),
+                responseTime: Math.round(performance.now() - startTime),
                 workflowExecuted: false
             }
         };
@@ -327,145 +442,183 @@ async function handleNonMedicalQuery(
 /**
  * Determine if a query is medical-related
  */
-async function isMedicalRelated(query: string): Promise<boolean> {
-    const medicalKeywords = [
-        'symptom', 'symptoms', 'pain', 'hurt', 'ache', 'fever', 'temperature',
-        'medication', 'medicine', 'drug', 'prescription', 'dosage',
-        'doctor', 'physician', 'hospital', 'clinic', 'medical',
-        'diagnosis', 'treatment', 'therapy', 'surgery', 'operation',
-        'health', 'wellness', 'sick', 'illness', 'disease', 'condition',
-        'blood', 'pressure', 'heart', 'lung', 'kidney', 'liver',
-        'diabetes', 'cancer', 'covid', 'flu', 'infection',
-        'allergy', 'allergic', 'reaction', 'side effect',
-        'test', 'lab', 'laboratory', 'x-ray', 'scan', 'mri', 'ct',
-        'vaccine', 'vaccination', 'immunization',
-        // Document analysis keywords
-        'document', 'pdf', 'report', 'uploaded', 'file', 'analyze', 'analysis',
-        'information', 'content', 'data', 'results', 'findings'
-    ];
-
-    const lowerQuery = query.toLowerCase();
-    return medicalKeywords.some(keyword => lowerQuery.includes(keyword));
+function isMedicalRelated(query: string): boolean {
+    return MEDICAL_KEYWORD_PATTERN.test(query);
 }
 
 /**
- * Create initial chat record
+ * Collect providers, total model cost and the first response content in a single pass
  */
-async function createInitialChatRecord(
+function summarizeModelResponses(modelResponses: DoctorGPTState['modelResponses'] = []): {
+    providers: string[];
+    totalCost: number;
+    firstContent?: string;
+} {
+    const providers: string[] = [];
+    let totalCost = 0;
+    let firstContent: string | undefined;
+
+    for (const entry of modelResponses) {
+        providers.push(entry.provider);
+        totalCost += typeof entry.cost === 'number' ? entry.cost : 0;
+        firstContent ??= entry.response?.content;
+    }
+
+    return { providers, totalCost, firstContent };
+}
+
+/**
+ * Fill in text for documents the client sent by reference only
+ * Upload responses no longer carry the extracted text, so it is read back from the stored reports in one query
+ */
+async function loadMissingDocumentText(documents: UploadedDocument[], userId: string): Promise<void> {
+    const missing = documents.filter(doc => !doc.content);
+    if (missing.length === 0) return;
+
+    const reports = await prisma.medicalReport.findMany({
+        // Scoped to the requesting user, so a client can't pull another user's report text into its chat
+        where: { id: { in: missing.map(doc => doc.id) }, userId },
+        select: { id: true, extractedText: true }
+    });
+    const textById = new Map(reports.map(report => [report.id, report.extractedText]));
+
+    for (const doc of missing) {
+        const text = textById.get(doc.id) || '';
+        doc.content = text;
+        doc.extractedText = text;
+    }
+}
+
+/**
+ * Ensure the chat session (and its user) exists before the workflow runs
+ */
+async function ensureChatSession(
     userId: string,
     sessionId: string,
-    chatId: string,
     userMessage: string
 ): Promise<void> {
     try {
-        // Create user if doesn't exist
-        await prisma.user.upsert({
-            where: { id: userId },
-            update: {},
-            create: {
-                id: userId,
-                email: `user-${userId}@example.com`,
-                name: 'Medical User'
-            }
-        });
-
-        // Create session if doesn't exist
+        // Upsert the session and its user in one call; the user is only created alongside a new session
         await prisma.session.upsert({
             where: { id: sessionId },
             update: { updatedAt: new Date() },
+            // Only the write matters; skip materializing the full session row
+            select: { id: true },
             create: {
                 id: sessionId,
-                userId,
                 title: userMessage.substring(0, 50) + '...',
-                isActive: true
-            }
-        });
-
-        // Save user message
-        await prisma.chat.create({
-            data: {
-                id: chatId + '-user',
-                sessionId,
-                userId,
-                role: 'USER',
-                content: userMessage,
-                isHealthcareQuery: true,
-                metadata: {
-                    originalQuery: userMessage,
-                    timestamp: new Date().toISOString()
+                isActive: true,
+                user: {
+                    connectOrCreate: {
+                        where: { id: userId },
+                        create: {
+                            id: userId,
+                            email: `user-${userId}@example.com`,
+                            name: 'Medical User'
+                        }
+                    }
                 }
             }
         });
 
     } catch (error) {
-        console.error('Failed to create initial chat record:', error);
+        console.error('Failed to ensure chat session:', error);
     }
 }
 
 /**
- * Update chat record with response
+ * Cost and timing of serving one exchange; originalCost is set when a cached workflow result was reused
  */
-async function updateChatWithResponse(
+interface ExchangeUsage {
+    totalCost: number;
+    responseTime: number;
+    originalCost?: number;
+}
+
+/**
+ * Save the user message and assistant response together in a single insert
+ */
+async function saveChatExchange(
     userId: string,
     sessionId: string,
     chatId: string,
-    workflowResult: DoctorGPTState
+    userMessage: string,
+    responseContent: string,
+    modelProviders: string[],
+    workflowResult: DoctorGPTState,
+    usage: ExchangeUsage
 ): Promise<void> {
-    try {
-        // Save assistant response - ensure we have content
-        const responseContent = workflowResult.finalResponse?.content ||
-            workflowResult.modelResponses?.[0]?.response?.content ||
-            'I apologize, but I encountered an issue processing your request. Please try again.';
+    // Both rows are written together, so they share one timestamp
+    const timestamp = new Date().toISOString();
+    const userChat: Prisma.ChatCreateManyInput = {
+        id: chatId + '-user',
+        sessionId,
+        userId,
+        role: 'USER',
+        content: userMessage,
+        isHealthcareQuery: true,
+        // The message text already lives in `content`; don't encode a second copy into the metadata JSON
+        metadata: { timestamp }
+    };
 
-        if (responseContent) {
-            await prisma.chat.create({
-                data: {
+    try {
+        await prisma.chat.createMany({
+            data: [
+                userChat,
+                {
                     id: chatId + '-assistant',
                     sessionId,
                     userId,
                     role: 'ASSISTANT',
                     content: responseContent,
                     isHealthcareQuery: true,
-                    citations: workflowResult.citations ? JSON.stringify(workflowResult.citations) : '[]',
+                    // Json column: hand Prisma the array so it is encoded once, not stored as a JSON string
+                    citations: (workflowResult.citations ?? []) as Prisma.InputJsonValue,
                     confidence: workflowResult.confidence || 0.5,
                     metadata: {
-                        modelProviders: workflowResult.modelResponses?.map(r => r.provider) || [],
-                        totalCost: workflowResult.metadata?.totalWorkflowCost || 0,
+                        modelProviders,
+                        totalCost: usage.totalCost,
                         workflowExecuted: true,
-                        responseTime: workflowResult.metadata?.executionTime || 0,
+                        responseTime: usage.responseTime,
+                        ...(usage.originalCost !== undefined && {
+                            cached: true,
+                            originalCost: usage.originalCost,
+                            originalResponseTime: workflowResult.metadata?.executionTime || 0
+                        }),
                         citationCount: workflowResult.citations?.length || 0,
-                        timestamp: new Date().toISOString(),
+                        timestamp,
                         hasUploadedDocuments: (workflowResult.uploadedDocuments?.length || 0) > 0,
                         workflowState: workflowResult.currentNode || 'completed'
                     }
                 }
-            });
+            ]
+        });
 
-            console.log('Successfully saved assistant response to database');
-        } else {
-            console.warn('No content available to save from workflow result');
-        }
+        console.log('Successfully saved chat exchange to database');
     } catch (error) {
-        console.error('Failed to update chat with response:', error);
+        console.error('Failed to save chat exchange:', error);
 
         // Try to save a fallback response to prevent data loss
         try {
-            await prisma.chat.create({
-                data: {
-                    id: chatId + '-assistant-fallback',
-                    sessionId,
-                    userId,
-                    role: 'ASSISTANT',
-                    content: 'I apologize, but I encountered a technical issue while processing your request. Please try asking your question again.',
-                    isHealthcareQuery: true,
-                    citations: '[]',
-                    confidence: 0.1,
-                    metadata: {
-                        error: 'Failed to process workflow result',
-                        timestamp: new Date().toISOString(),
-                        fallbackResponse: true
+            await prisma.chat.createMany({
+                data: [
+                    userChat,
+                    {
+                        id: chatId + '-assistant-fallback',
+                        sessionId,
+                        userId,
+                        role: 'ASSISTANT',
+                        content: FALLBACK_ASSISTANT_RESPONSE,
+                        isHealthcareQuery: true,
+                        citations: [],
+                        confidence: 0.1,
+                        metadata: {
+                            error: 'Failed to process workflow result',
+                            timestamp,
+                            fallbackResponse: true
+                        }
                     }
-                }
+                ]
             });
         } catch (fallbackError) {
             console.error('Failed to save fallback response:', fallbackError);
@@ -533,7 +686,7 @@ async function saveChatToDatabase(
                     role: 'ASSISTANT',
                     content: workflowResult.finalResponse.content,
                     isHealthcareQuery: true,
-                    citations: workflowResult.citations ? JSON.stringify(workflowResult.citations) : undefined,
+                    citations: (workflowResult.citations ?? []) as Prisma.InputJsonValue,
                     confidence: workflowResult.confidence,
                     metadata: {
                         modelProviders: workflowResult.modelResponses?.map(r => r.provider) || [],
@@ -558,37 +711,33 @@ async function saveChatToDatabase(
  */
 function createStream(text: string): ReadableStream<Uint8Array> {
     const encoder = new TextEncoder();
+    const words = text.split(' ');
+    let index = 0;
 
+    // Chunks are emitted as fast as the client reads them; no artificial per-word delay
     return new ReadableStream({
-        start(controller) {
-            // Stream the text in chunks for a more natural feel
-            const words = text.split(' ');
-            let index = 0;
-
-            const pushWord = () => {
-                if (index < words.length) {
-                    const word = words[index] + (index < words.length - 1 ? ' ' : '');
-                    controller.enqueue(encoder.encode(word));
-                    index++;
-
-                    // Add a small delay between words for streaming effect
-                    setTimeout(pushWord, 50);
-                } else {
-                    controller.close();
-                }
-            };
+        pull(controller) {
+            if (index >= words.length) {
+                controller.close();
+                return;
+            }
 
-            pushWord();
+            const end = Math.min(index + STREAM_CHUNK_WORDS, words.length);
+            const chunk = words.slice(index, end).join(' ') + (end < words.length ? ' ' : '');
+            controller.enqueue(encoder.encode(chunk));
+            index = end;
         }
     });
 }
 
+// Static part of the health check body, built once; each probe adds only its timestamp
+const HEALTH_STATIC = Object.freeze({
+    status: 'healthy',
+    service: 'doctor-gpt-chat-api',
+    version: '1.0.0'
+});
+
 // Export GET method for health check
 export async function GET() {
-    return NextResponse.json({
-        status: 'healthy',
-        service: 'doctor-gpt-chat-api',
-        version: '1.0.0',
-        timestamp: new Date().toISOString()
-    });
+    return NextResponse.json({ ...HEALTH_STATIC, timestamp: new Date().toISOString() });
 }
@@ -0,0 +1,59 @@
+/**
+ * Cost Log Export API
+ * Streams a user's cost logs as newline-delimited JSON, one log per line
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+
+// Force Node.js runtime for Prisma compatibility
+export const runtime = 'nodejs';
+import { z } from 'zod';
+import { costTracker } from '../../../../lib/cost-tracking/tracker';
+
+const exportQuerySchema = z.object({
+    userId: z.string().min(1),
+    start: z.coerce.date().optional(),
+    end: z.coerce.date().optional()
+});
+
+export async function GET(req: NextRequest) {
+    const parsed = exportQuerySchema.safeParse(Object.fromEntries(req.nextUrl.searchParams));
+
+    if (!parsed.success) {
+        return NextResponse.json(
+            { error: 'Invalid export request', details: parsed.error.flatten().fieldErrors },
+            { status: 400 }
+        );
+    }
+
+    const { userId, start, end } = parsed.data;
+    const logs = costTracker.streamCostLogs(userId, start, end);
+
+    // Pull rows only as the client reads, so the export never materializes the full result set
+    const encoder = new TextEncoder();
+    const stream = new ReadableStream<Uint8Array>({
+        async pull(controller) {
+            try {
+                const next = await logs.next();
+                if (next.done) {
+                    controller.close();
+                    return;
+                }
+                controller.enqueue(encoder.encode(JSON.stringify(next.value) + '\n'));
+            } catch (error) {
+                console.error('Cost log export failed:', error);
+                controller.error(error);
+            }
+        },
+        async cancel() {
+            await logs.return(undefined);
+        }
+    });
+
+    return new Response(stream, {
+        headers: {
+            'Content-Type': 'application/x-ndjson',
+            'Cache-Control': 'no-cache'
+        }
+    });
+}
@@ -0,0 +1,49 @@
+/**
+ * Medical Document Text API
+ * Serves the extracted text of an uploaded medical document, kept out of the upload response
+ */
+
+import { NextRequest, NextResponse } from 'next/server';
+
+// Force Node.js runtime for Prisma compatibility
+export const runtime = 'nodejs';
+import { getPrismaClient } from '../../../../../../lib/db/prisma';
+
+// Shared Prisma client, reusing the process-wide connection pool
+const prisma = getPrismaClient();
+
+export async function GET(req: NextRequest, { params }: { params: Promise<{ id: string }> }) {
+    const { id } = await params;
+    const userId = req.nextUrl.searchParams.get('userId');
+
+    if (!userId) {
+        return NextResponse.json(
+            { success: false, error: 'userId is required' },
+            { status: 400 }
+        );
+    }
+
+    try {
+        // Scoped to the owner; another user's report id resolves as not found
+        const report = await prisma.medicalReport.findFirst({
+            where: { id, userId },
+            select: { id: true, extractedText: true }
+        });
+
+        if (!report) {
+            return NextResponse.json(
+                { success: false, error: 'Document not found' },
+                { status: 404 }
+            );
+        }
+
+        return NextResponse.json({ success: true, id: report.id, extractedText: report.extractedText });
+
+    } catch (error) {
+        console.error('Failed to load document text:', error);
+        return NextResponse.json(
+            { success: false, error: 'Failed to load document text' },
+            { status: 500 }
+        );
+    }
+}
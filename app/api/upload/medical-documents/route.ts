@@ -3,17 +3,29 @@
  * Handles file uploads with text extraction and processing for medical documents
  */
 
-import { NextRequest, NextResponse } from 'next/server';
+import { NextRequest, NextResponse, after } from 'next/server';
 
 // Force Node.js runtime for Prisma compatibility
 export const runtime = 'nodejs';
-import { PrismaClient } from '@prisma/client';
+import { z } from 'zod';
+import { getPrismaClient } from '../../../../lib/db/prisma';
+import { uuidv7 } from '../../../../lib/db/ids';
 import { config } from '../../../../config';
 import { costTracker } from '../../../../lib/cost-tracking/tracker';
 import { Operation } from '../../../../lib/cost-tracking/types';
+import { findMedicalTags, getMedicalDataService } from '../../../../lib/medical/medical-data-service';
+import { modelRepository } from '../../../../lib/models/repository';
 
-// Initialize Prisma client
-const prisma = new PrismaClient();
+// Shared Prisma client, reusing the process-wide connection pool
+const prisma = getPrismaClient();
+
+// Resolve shared services once per module instead of on every request
+const medicalService = getMedicalDataService(prisma);
+
+// Settings read on every request, bound once; configuration is fixed after startup
+const MAX_FILE_SIZE = config.maxFileSize;
+const FILE_TOO_LARGE_ERROR = `File size exceeds limit of ${MAX_FILE_SIZE / 1024 / 1024}MB`;
+const EXPOSE_ERROR_DETAILS = config.isDevelopment;
 
 // File type mappings
 const ALLOWED_FILE_TYPES = {
@@ -35,6 +47,32 @@ const MEDICAL_REPORT_TYPES = {
     'other': 'OTHER'
 } as const;
 
+type AllowedFileType = (typeof ALLOWED_FILE_TYPES)[keyof typeof ALLOWED_FILE_TYPES];
+type ReportTypeValue = (typeof MEDICAL_REPORT_TYPES)[keyof typeof MEDICAL_REPORT_TYPES];
+
+// Lookup maps built once at module load, so per-upload checks are single hash lookups
+const FILE_TYPE_BY_MIME = new Map<string, AllowedFileType>(Object.entries(ALLOWED_FILE_TYPES));
+const REPORT_TYPE_BY_NAME = new Map<string, ReportTypeValue>(Object.entries(MEDICAL_REPORT_TYPES));
+const EXTRACTION_METHODS = new Map<string, string>([
+    ['txt', 'direct_text'],
+    ['pdf', 'pdf_parsing'],
+    ['docx', 'docx_parsing'],
+    ['jpg', 'ocr_tesseract'],
+    ['png', 'ocr_tesseract'],
+    ['gif', 'ocr_tesseract']
+]);
+
+// Keywords used to tag uploaded documents
+const MEDICAL_TAG_KEYWORDS: readonly string[] = [
+    'blood pressure', 'diabetes', 'cholesterol', 'heart rate', 'temperature',
+    'medication', 'prescription', 'dosage', 'treatment', 'diagnosis',
+    'symptoms', 'pain', 'fever', 'infection', 'allergy', 'test results',
+    'x-ray', 'mri', 'ct scan', 'ultrasound', 'biopsy', 'surgery'
+];
+
+// Client metadata must be a JSON object; built once and reused for every upload
+const uploadMetadataSchema = z.record(z.any());
+
 interface UploadRequest {
     userId?: string;
     sessionId?: string;
@@ -49,7 +87,9 @@ interface UploadResponse {
         fileName: string;
         fileType: string;
         fileSize: number;
-        extractedText: string;
+        // Only inlined when requested with ?includeText=true; otherwise fetch it from textUrl
+        extractedText?: string;
+        textUrl: string;
         summary?: string;
         reportType: string;
         processingStatus: string;
@@ -62,7 +102,7 @@ interface UploadResponse {
 }
 
 export async function POST(req: NextRequest) {
-    const startTime = Date.now();
+    const startTime = performance.now();
 
     try {
         // Parse form data
@@ -82,31 +122,35 @@ export async function POST(req: NextRequest) {
         }
 
         // Check file size
-        if (file.size > config.maxFileSize) {
+        if (file.size > MAX_FILE_SIZE) {
             return NextResponse.json(
-                { success: false, error: `File size exceeds limit of ${config.maxFileSize / 1024 / 1024}MB` },
+                { success: false, error: FILE_TOO_LARGE_ERROR },
                 { status: 400 }
             );
         }
 
         // Check file type
-        if (!Object.keys(ALLOWED_FILE_TYPES).includes(file.type)) {
+        const fileType = FILE_TYPE_BY_MIME.get(file.type);
+        if (!fileType) {
             return NextResponse.json(
                 { success: false, error: `File type ${file.type} not supported` },
                 { status: 400 }
             );
         }
 
-        const fileType = ALLOWED_FILE_TYPES[file.type as keyof typeof ALLOWED_FILE_TYPES];
-
         // Parse metadata
         let metadata: Record<string, any> = {};
-        try {
-            if (metadataStr) {
-                metadata = JSON.parse(metadataStr);
+        if (metadataStr) {
+            try {
+                const parsed = uploadMetadataSchema.safeParse(JSON.parse(metadataStr));
+                if (parsed.success) {
+                    metadata = parsed.data;
+                } else {
+                    console.warn('Metadata is not a JSON object, using empty object');
+                }
+            } catch {
+                console.warn('Failed to parse metadata, using empty object');
             }
-        } catch {
-            console.warn('Failed to parse metadata, using empty object');
         }
 
         console.log(`Processing file upload: ${file.name} (${fileType}) for user: ${userId}`);
@@ -114,67 +158,64 @@ export async function POST(req: NextRequest) {
         // Extract text from file
         const { extractedText, extractionCost } = await extractTextFromFile(file, fileType);
 
-        // Generate summary if text is long enough
-        let summary: string | undefined;
-        let summaryCost = 0;
-        if (extractedText.length > 500) {
-            const summaryResult = await generateDocumentSummary(extractedText, userId);
-            summary = summaryResult.summary;
-            summaryCost = summaryResult.cost;
-        }
+        // Summary, type detection and tagging are independent, so overlap them
+        const [summaryResult, detectionResult, medicalTags] = await Promise.all([
+            // Generate summary if text is long enough
+            extractedText.length > 500 ? generateDocumentSummary(extractedText, userId) : undefined,
+            // Detect report type if not specified or if 'other'
+            reportType === 'other' && extractedText.length > 100 ? detectReportType(extractedText, userId) : undefined,
+            extractMedicalTags(extractedText)
+        ]);
 
-        // Detect report type if not specified or if 'other'
-        let detectedReportType = reportType;
-        let detectionCost = 0;
-        if (reportType === 'other' && extractedText.length > 100) {
-            const detectionResult = await detectReportType(extractedText, userId);
-            detectedReportType = detectionResult.reportType;
-            detectionCost = detectionResult.cost;
-        }
+        const summary = summaryResult?.summary;
+        const summaryCost = summaryResult?.cost ?? 0;
+        const detectedReportType = detectionResult?.reportType ?? reportType;
+        const detectionCost = detectionResult?.cost ?? 0;
 
         // Create document record in database
-        const documentId = crypto.randomUUID();
-
-        // Create user if doesn't exist
-        await prisma.user.upsert({
-            where: { id: userId },
-            update: {},
-            create: {
-                id: userId,
-                email: `user-${userId}@example.com`,
-                name: 'Medical User'
-            }
-        });
+        const documentId = uuidv7();
+
+        // Build the report metadata once; the vector ingestion payload extends the same object
+        const reportMetadata = {
+            ...metadata,
+            originalFileName: file.name,
+            uploadTimestamp: new Date().toISOString(),
+            processingTime: Math.round(performance.now() - startTime),
+            fileSize: file.size,
+            extractionMethod: getExtractionMethod(fileType)
+        };
 
         // Save document to database
         const medicalReport = await prisma.medicalReport.create({
             data: {
                 id: documentId,
-                userId,
+                // Create user if doesn't exist, in the same statement as the report insert
+                user: {
+                    connectOrCreate: {
+                        where: { id: userId },
+                        create: {
+                            id: userId,
+                            email: `user-${userId}@example.com`,
+                            name: 'Medical User'
+                        }
+                    }
+                },
                 fileName: file.name,
                 fileType,
                 fileSize: file.size,
                 extractedText,
                 summary,
-                reportType: MEDICAL_REPORT_TYPES[detectedReportType as keyof typeof MEDICAL_REPORT_TYPES] || 'OTHER',
+                reportType: REPORT_TYPE_BY_NAME.get(detectedReportType) ?? 'OTHER',
                 processingStatus: 'COMPLETED',
-                medicalTags: await extractMedicalTags(extractedText),
-                metadata: {
-                    ...metadata,
-                    originalFileName: file.name,
-                    uploadTimestamp: new Date().toISOString(),
-                    processingTime: Date.now() - startTime,
-                    fileSize: file.size,
-                    extractionMethod: getExtractionMethod(fileType)
-                }
-            }
+                medicalTags,
+                metadata: reportMetadata
+            },
+            // The response is built from the values written above; don't read the full row (and its text) back
+            select: { id: true, reportType: true, processingStatus: true }
         });
 
         // Ingest document into vector database for session-specific RAG
         try {
-            const { getMedicalDataService } = await import('../../../../lib/medical/medical-data-service');
-            const medicalService = getMedicalDataService(prisma);
-
             const sessionDocument = {
                 id: documentId,
                 sessionId,
@@ -184,10 +225,10 @@ export async function POST(req: NextRequest) {
                 extractedText,
                 fileType,
                 metadata: {
-                    ...metadata,
+                    ...reportMetadata,
                     summary,
                     reportType: detectedReportType,
-                    medicalTags: await extractMedicalTags(extractedText)
+                    medicalTags
                 }
             };
 
@@ -203,9 +244,9 @@ export async function POST(req: NextRequest) {
             // Don't fail the upload if vector ingestion fails
         }
 
-        // Track costs
+        // Track costs once the response has been sent
         const totalCost = extractionCost + summaryCost + detectionCost;
-        await costTracker.trackCost({
+        after(() => costTracker.trackCost({
             userId,
             sessionId,
             operation: Operation.FILE_PROCESSING,
@@ -224,17 +265,18 @@ export async function POST(req: NextRequest) {
                     [true, !!summary, detectedReportType !== reportType][i]
                 )
             }
-        });
+        }).catch(costError => console.error('Failed to track upload cost:', costError)));
 
         const response: UploadResponse = {
             success: true,
             document: {
                 id: medicalReport.id,
-                fileName: medicalReport.fileName,
-                fileType: medicalReport.fileType,
-                fileSize: medicalReport.fileSize,
-                extractedText: medicalReport.extractedText,
-                summary: medicalReport.summary || undefined,
+                fileName: file.name,
+                fileType,
+                fileSize: file.size,
+                extractedText: req.nextUrl.searchParams.get('includeText') === 'true' ? extractedText : undefined,
+                textUrl: `/api/upload/medical-documents/${medicalReport.id}/text?userId=${encodeURIComponent(userId)}`,
+                summary,
                 reportType: medicalReport.reportType || 'OTHER',
                 processingStatus: medicalReport.processingStatus
             },
@@ -248,37 +290,34 @@ export async function POST(req: NextRequest) {
             }
         };
 
-        console.log(`Document processed successfully: ${documentId} in ${Date.now() - startTime}ms`);
+        console.log(`Document processed successfully: ${documentId} in ${Math.round(performance.now() - startTime)}ms`);
 
         return NextResponse.json(response);
 
     } catch (error) {
         console.error('File upload processing failed:', error);
 
-        // Track error cost
-        try {
-            await costTracker.trackCost({
-                userId: 'unknown',
-                operation: Operation.FILE_PROCESSING,
-                provider: 'error',
-                inputCost: 0,
-                outputCost: 0.001,
-                totalCost: 0.001,
-                currency: 'USD',
-                metadata: {
-                    error: error instanceof Error ? error.message : 'Unknown error',
-                    endpoint: '/api/upload/medical-documents'
-                }
-            });
-        } catch (costError) {
-            console.error('Failed to track error cost:', costError);
-        }
+        // Track error cost once the error response has been sent
+        const message = error instanceof Error ? error.message : 'Unknown error';
+        after(() => costTracker.trackCost({
+            userId: 'unknown',
+            operation: Operation.FILE_PROCESSING,
+            provider: 'error',
+            inputCost: 0,
+            outputCost: 0.001,
+            totalCost: 0.001,
+            currency: 'USD',
+            metadata: {
+                error: message,
+                endpoint: '/api/upload/medical-documents'
+            }
+        }).catch(costError => console.error('Failed to track error cost:', costError)));
 
         return NextResponse.json(
             {
                 success: false,
                 error: 'Failed to process file',
-                details: config.isDevelopment ? (error instanceof Error ? error.message : 'Unknown error') : undefined
+                details: EXPOSE_ERROR_DETAILS ? (error instanceof Error ? error.message : 'Unknown error') : undefined
             },
             { status: 500 }
         );
@@ -289,27 +328,25 @@ export async function POST(req: NextRequest) {
  * Extract text from uploaded file based on file type
  */
 async function extractTextFromFile(file: File, fileType: string): Promise<{ extractedText: string; extractionCost: number }> {
-    const fileBuffer = await file.arrayBuffer();
-    const uint8Array = new Uint8Array(fileBuffer);
-
+    // Each extractor reads the file itself, so bytes are only copied out of the form data when a parser needs them
     let extractedText = '';
     let extractionCost = 0.0005; // Base extraction cost
 
     try {
         switch (fileType) {
             case 'txt':
-                extractedText = new TextDecoder().decode(uint8Array);
+                extractedText = await file.text();
                 break;
 
             case 'pdf':
                 // In production, use a PDF parsing library like pdf-parse
-                extractedText = await extractTextFromPDF(uint8Array);
+                extractedText = await extractTextFromPDF(new Uint8Array(await file.arrayBuffer()));
                 extractionCost = 0.001; // Higher cost for PDF processing
                 break;
 
             case 'docx':
                 // In production, use a DOCX parsing library
-                extractedText = await extractTextFromDOCX(uint8Array);
+                extractedText = await extractTextFromDOCX(file);
                 extractionCost = 0.001;
                 break;
 
@@ -317,7 +354,7 @@ async function extractTextFromFile(file: File, fileType: string): Promise<{ extr
             case 'png':
             case 'gif':
                 // In production, use OCR service like Tesseract or cloud OCR
-                extractedText = await extractTextFromImage(uint8Array, fileType);
+                extractedText = await extractTextFromImage(file, fileType);
                 extractionCost = 0.002; // Higher cost for OCR
                 break;
 
@@ -357,7 +394,7 @@ async function extractTextFromPDF(buffer: Uint8Array): Promise<string> {
 /**
  * Extract text from DOCX (placeholder implementation)  
  */
-async function extractTextFromDOCX(buffer: Uint8Array): Promise<string> {
+async function extractTextFromDOCX(file: File): Promise<string> {
     // Placeholder implementation
     // In production, use mammoth.js or similar library
     return '[DOCX text extraction would be implemented here with mammoth.js library]';
@@ -366,7 +403,7 @@ async function extractTextFromDOCX(buffer: Uint8Array): Promise<string> {
 /**
  * Extract text from image using OCR (placeholder implementation)
  */
-async function extractTextFromImage(buffer: Uint8Array, fileType: string): Promise<string> {
+async function extractTextFromImage(file: File, fileType: string): Promise<string> {
     // Placeholder implementation
     // In production, use Tesseract.js or cloud OCR service
     return '[Image OCR text extraction would be implemented here with Tesseract.js or cloud OCR]';
@@ -377,8 +414,6 @@ async function extractTextFromImage(buffer: Uint8Array, fileType: string): Promi
  */
 async function generateDocumentSummary(text: string, userId: string): Promise<{ summary: string; cost: number }> {
     try {
-        const { modelRepository } = await import('../../../../lib/models/repository');
-
         const response = await modelRepository.complete(
             'openai',
             [
@@ -409,8 +444,6 @@ async function generateDocumentSummary(text: string, userId: string): Promise<{
  */
 async function detectReportType(text: string, userId: string): Promise<{ reportType: string; cost: number }> {
     try {
-        const { modelRepository } = await import('../../../../lib/models/repository');
-
         const response = await modelRepository.complete(
             'openai',
             [
@@ -438,8 +471,7 @@ async function detectReportType(text: string, userId: string): Promise<{ reportT
         );
 
         const detectedType = response.content.trim().toLowerCase();
-        const validTypes = Object.keys(MEDICAL_REPORT_TYPES);
-        const reportType = validTypes.includes(detectedType) ? detectedType : 'other';
+        const reportType = REPORT_TYPE_BY_NAME.has(detectedType) ? detectedType : 'other';
 
         const cost = response.usage.totalTokens * 0.00000075;
 
@@ -454,46 +486,29 @@ async function detectReportType(text: string, userId: string): Promise<{ reportT
 /**
  * Extract medical tags from document text
  */
-async function extractMedicalTags(text: string): Promise<string[]> {
+function extractMedicalTags(text: string): string[] {
     // Simple keyword-based tagging
     // In production, this would use NLP models
-    const medicalKeywords = [
-        'blood pressure', 'diabetes', 'cholesterol', 'heart rate', 'temperature',
-        'medication', 'prescription', 'dosage', 'treatment', 'diagnosis',
-        'symptoms', 'pain', 'fever', 'infection', 'allergy', 'test results',
-        'x-ray', 'mri', 'ct scan', 'ultrasound', 'biopsy', 'surgery'
-    ];
-
-    const lowerText = text.toLowerCase();
-    const foundTags = medicalKeywords.filter(keyword => lowerText.includes(keyword));
-
-    return foundTags.slice(0, 10); // Limit to 10 tags
+    return findMedicalTags(text, MEDICAL_TAG_KEYWORDS); // Limited to 10 tags
 }
 
 /**
  * Get extraction method name for metadata
  */
 function getExtractionMethod(fileType: string): string {
-    const methods = {
-        'txt': 'direct_text',
-        'pdf': 'pdf_parsing',
-        'docx': 'docx_parsing',
-        'jpg': 'ocr_tesseract',
-        'png': 'ocr_tesseract',
-        'gif': 'ocr_tesseract'
-    };
-
-    return methods[fileType as keyof typeof methods] || 'unknown';
+    return EXTRACTION_METHODS.get(fileType) ?? 'unknown';
 }
 
+// Static part of the health check body, built once; each probe adds only its timestamp
+const HEALTH_STATIC = Object.freeze({
+    status: 'healthy',
+    service: 'medical-document-upload-api',
+    supportedTypes: Object.keys(ALLOWED_FILE_TYPES),
+    maxFileSize: MAX_FILE_SIZE,
+    version: '1.0.0'
+});
+
 // Export GET method for health check
 export async function GET() {
-    return NextResponse.json({
-        status: 'healthy',
-        service: 'medical-document-upload-api',
-        supportedTypes: Object.keys(ALLOWED_FILE_TYPES),
-        maxFileSize: config.maxFileSize,
-        version: '1.0.0',
-        timestamp: new Date().toISOString()
-    });
+    return NextResponse.json({ ...HEALTH_STATIC, timestamp: new Date().toISOString() });
 }
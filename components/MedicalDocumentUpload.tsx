@@ -10,7 +10,8 @@ interface UploadedDocument {
   id: string;
   fileName: string;
   fileSize: number;
-  extractedText: string;
+  extractedText?: string;
+  textUrl: string;
   reportType: string;
   processingStatus: string;
 }
@@ -24,6 +24,9 @@ const envSchema = z.object({
 
     // Vector Database Configuration
     VECTOR_DIMENSIONS: z.string().transform(Number).default('1536'),
+    QDRANT_URL: z.string().url().default('http://localhost:6333'),
+    QDRANT_API_KEY: z.string().optional(),
+    QDRANT_TIMEOUT_MS: z.string().transform(Number).default('30000'),
 
     // Cost Tracking
     ENABLE_COST_TRACKING: z.string().transform((val) => val === 'true').default('true'),
@@ -43,11 +46,19 @@ const envSchema = z.object({
 class Config {
     private static instance: Config;
     private _config: z.infer<typeof envSchema>;
+    // Read-only snapshot handed out by getConfig(); settings never change after startup
+    private _configSnapshot?: Readonly<z.infer<typeof envSchema>>;
+    // Outcome of the one startup parse, reported by validateConfig() instead of re-reading the environment
+    private _validationError: z.ZodError | null = null;
+    // Parsed once on first read; the comma-separated setting is fixed for the life of the process
+    private _allowedFileTypes?: readonly string[];
 
   private constructor() {
-    try {
-      this._config = envSchema.parse(process.env);
-    } catch (error) {
+    const parsed = envSchema.safeParse(process.env);
+    if (parsed.success) {
+      this._config = parsed.data;
+    } else {
+      this._validationError = parsed.error;
       // During build time, environment variables might not be available
       // Use default values for non-critical settings
       console.warn('⚠️ Configuration validation failed, using defaults for build time');
@@ -59,6 +70,9 @@ class Config {
         NODE_ENV: (process.env.NODE_ENV as any) || 'development',
         APP_URL: process.env.APP_URL || 'http://localhost:3000',
         VECTOR_DIMENSIONS: parseInt(process.env.VECTOR_DIMENSIONS || '1536'),
+        QDRANT_URL: process.env.QDRANT_URL || 'http://localhost:6333',
+        QDRANT_API_KEY: process.env.QDRANT_API_KEY,
+        QDRANT_TIMEOUT_MS: parseInt(process.env.QDRANT_TIMEOUT_MS || '30000'),
         ENABLE_COST_TRACKING: process.env.ENABLE_COST_TRACKING === 'true',
         RATE_LIMIT_MAX: parseInt(process.env.RATE_LIMIT_MAX || '100'),
         RATE_LIMIT_WINDOW: parseInt(process.env.RATE_LIMIT_WINDOW || '900000'),
@@ -135,6 +149,18 @@ class Config {
         return this._config.VECTOR_DIMENSIONS;
     }
 
+    get qdrantUrl(): string {
+        return this._config.QDRANT_URL;
+    }
+
+    get qdrantApiKey(): string | undefined {
+        return this._config.QDRANT_API_KEY;
+    }
+
+    get qdrantTimeoutMs(): number {
+        return this._config.QDRANT_TIMEOUT_MS;
+    }
+
     // Cost Tracking Configuration
     get enableCostTracking(): boolean {
         return this._config.ENABLE_COST_TRACKING;
@@ -154,8 +180,11 @@ class Config {
         return this._config.MAX_FILE_SIZE;
     }
 
-    get allowedFileTypes(): string[] {
-        return this._config.ALLOWED_FILE_TYPES.split(',').map(type => type.trim());
+    get allowedFileTypes(): readonly string[] {
+        if (!this._allowedFileTypes) {
+            this._allowedFileTypes = Object.freeze(this._config.ALLOWED_FILE_TYPES.split(',').map(type => type.trim()));
+        }
+        return this._allowedFileTypes;
     }
 
     // LangGraph Configuration
@@ -165,17 +194,18 @@ class Config {
 
     // Utility methods
     public validateConfig(): void {
-        try {
-            envSchema.parse(process.env);
-            console.log('✅ Configuration validation successful');
-        } catch (error) {
-            console.error('❌ Configuration validation failed:', error);
+        if (this._validationError) {
+            console.error('❌ Configuration validation failed:', this._validationError);
             process.exit(1);
         }
+        console.log('✅ Configuration validation successful');
     }
 
-    public getConfig() {
-        return { ...this._config };
+    public getConfig(): Readonly<z.infer<typeof envSchema>> {
+        if (!this._configSnapshot) {
+            this._configSnapshot = Object.freeze({ ...this._config });
+        }
+        return this._configSnapshot;
     }
 }
 
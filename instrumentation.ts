@@ -0,0 +1,14 @@
+/**
+ * Next.js instrumentation hook
+ * Runs once per server process on startup
+ */
+
+export async function register() {
+    if (process.env.NEXT_RUNTIME !== 'nodejs') return;
+
+    // Warm the vector database connection in the background so the server can start listening immediately
+    const { getQdrantService } = await import('./lib/vector/qdrant-service');
+    getQdrantService().warmup().catch((error) => {
+        console.warn('⚠️ Qdrant warmup failed:', error);
+    });
+}
@@ -3,7 +3,9 @@
  * Implements comprehensive cost tracking with real-time monitoring and budget management
  */
 
-import { PrismaClient } from '@prisma/client';
+import { Prisma, PrismaClient } from '@prisma/client';
+import { getPrismaClient } from '../db/prisma';
+import { uuidv7 } from '../db/ids';
 import { config } from '../../config';
 import {
     CostEntry,
@@ -17,15 +19,40 @@ import {
     BudgetExceededError
 } from './types';
 
+// Decimal places of cost_logs.costUsd (Decimal(10, 8)); costs are rounded to this once, in the flush,
+// and handed to Prisma as a decimal string so no float artifacts reach the column
+const COST_USD_SCALE = 8;
+
+// Rows per page when streaming cost logs out, and the columns an export carries
+const COST_EXPORT_PAGE_SIZE = 1000;
+const COST_EXPORT_SELECT = {
+    id: true,
+    chatId: true,
+    operation: true,
+    modelProvider: true,
+    modelName: true,
+    inputTokens: true,
+    outputTokens: true,
+    totalTokens: true,
+    costUsd: true,
+    createdAt: true
+} as const;
+
+// Cap on user ids remembered as existing; the set is simply reset when it fills
+const KNOWN_USERS_MAX_ENTRIES = 10000;
+
 export class CostTracker {
     private static instance: CostTracker;
     private prisma: PrismaClient;
     private costQueue: CostEntry[] = [];
+    // Users already confirmed to exist, so their cost rows skip the user insert
+    private knownUserIds = new Set<string>();
     private flushTimer?: NodeJS.Timeout;
     private readonly config: CostTrackingConfig;
 
     private constructor() {
-        this.prisma = new PrismaClient();
+        // Writes go through the process-wide client rather than a second connection pool
+        this.prisma = getPrismaClient();
         this.config = {
             enabled: config.enableCostTracking,
             flushInterval: 5000, // 5 seconds
@@ -85,16 +112,16 @@ export class CostTracker {
 
         const costEntry: CostEntry = {
             ...entry,
-            id: crypto.randomUUID(),
+            id: uuidv7(),
             timestamp: new Date()
         };
 
         // Add to queue for batch processing
         this.costQueue.push(costEntry);
 
-        // Check if we need to flush immediately
+        // Flush a full batch in the background; the caller only needs the entry queued
         if (this.costQueue.length >= this.config.batchSize) {
-            await this.flushCosts();
+            this.flushCosts().catch(console.error);
         }
 
         // Check budget limits in real-time for critical operations
@@ -211,49 +238,64 @@ export class CostTracker {
         const start = startDate || new Date(Date.now() - 30 * 24 * 60 * 60 * 1000); // 30 days ago
         const end = endDate || new Date();
 
-        // Get cost logs from database
-        const costLogs = await this.prisma.costLog.findMany({
-            where: {
-                userId,
-                createdAt: {
-                    gte: start,
-                    lte: end
-                }
+        const where = {
+            userId,
+            createdAt: {
+                gte: start,
+                lte: end
             }
-        });
+        };
 
-        // Calculate totals
-        const totalCost = costLogs.reduce((sum: number, log: any) => sum + Number(log.costUsd), 0);
-        const totalRequests = costLogs.length;
-        const totalTokens = costLogs.reduce((sum: number, log: any) => sum + (log.totalTokens || 0), 0);
+        // Let Postgres do the grouping so only one row per group comes back, not every cost log
+        const [totals, operationGroups, providerGroups, dailyCosts] = await Promise.all([
+            this.prisma.costLog.aggregate({
+                where,
+                _sum: { costUsd: true, totalTokens: true },
+                _count: { _all: true }
+            }),
+            this.prisma.costLog.groupBy({
+                by: ['operation'],
+                where,
+                _sum: { costUsd: true },
+                _count: { _all: true }
+            }),
+            this.prisma.costLog.groupBy({
+                by: ['modelProvider'],
+                where,
+                _sum: { costUsd: true, totalTokens: true },
+                _count: { _all: true }
+            }),
+            this.prisma.$queryRaw<Array<{ date: string; cost: number; requests: number }>>`
+                SELECT to_char("createdAt", 'YYYY-MM-DD') AS date,
+                       SUM("costUsd")::float8 AS cost,
+                       COUNT(*)::int AS requests
+                FROM cost_logs
+                WHERE "userId" = ${userId} AND "createdAt" >= ${start} AND "createdAt" <= ${end}
+                GROUP BY 1
+                ORDER BY 1
+            `
+        ]);
+
+        const byOperation = {} as CostSummary['byOperation'];
+        for (const group of operationGroups) {
+            const count = group._count._all;
+            const cost = Number(group._sum.costUsd) || 0;
+            byOperation[group.operation as Operation] = { count, totalCost: cost, avgCost: cost / count };
+        }
 
-        // Group by operation
-        const byOperation = costLogs.reduce((acc: CostSummary['byOperation'], log: any) => {
-            const op = log.operation as Operation;
-            if (!acc[op]) {
-                acc[op] = { count: 0, totalCost: 0, avgCost: 0 };
-            }
-            acc[op].count++;
-            acc[op].totalCost += Number(log.costUsd);
-            acc[op].avgCost = acc[op].totalCost / acc[op].count;
-            return acc;
-        }, {} as CostSummary['byOperation']);
-
-        // Group by provider
-        const byProvider = costLogs.reduce((acc: CostSummary['byProvider'], log: any) => {
-            const provider = log.modelProvider || 'unknown';
-            if (!acc[provider]) {
-                acc[provider] = { count: 0, totalCost: 0, avgCost: 0, totalTokens: 0 };
-            }
-            acc[provider].count++;
-            acc[provider].totalCost += Number(log.costUsd);
-            acc[provider].avgCost = acc[provider].totalCost / acc[provider].count;
-            acc[provider].totalTokens += log.totalTokens || 0;
-            return acc;
-        }, {} as CostSummary['byProvider']);
+        const byProvider: CostSummary['byProvider'] = {};
+        for (const group of providerGroups) {
+            const provider = group.modelProvider || 'unknown';
+            const providerTotals = byProvider[provider] || (byProvider[provider] = { count: 0, totalCost: 0, avgCost: 0, totalTokens: 0 });
+            providerTotals.count += group._count._all;
+            providerTotals.totalCost += Number(group._sum.costUsd) || 0;
+            providerTotals.totalTokens += group._sum.totalTokens || 0;
+            providerTotals.avgCost = providerTotals.totalCost / providerTotals.count;
+        }
 
-        // Generate daily costs
-        const dailyCosts = this.generateDailyCosts(costLogs, start, end);
+        const totalCost = Number(totals._sum.costUsd) || 0;
+        const totalTokens = totals._sum.totalTokens || 0;
+        const totalRequests = totals._count._all;
 
         return {
             userId,
@@ -269,6 +311,41 @@ export class CostTracker {
         };
     }
 
+    /**
+     * Stream a user's cost logs in creation order, one page at a time
+     * Pages are read with a keyset cursor, so exports hold at most one page in memory however many rows match
+     */
+    public async *streamCostLogs(
+        userId: string,
+        startDate?: Date,
+        endDate?: Date,
+        pageSize: number = COST_EXPORT_PAGE_SIZE
+    ) {
+        const where = {
+            userId,
+            createdAt: {
+                gte: startDate,
+                lte: endDate
+            }
+        };
+        let cursor: string | undefined;
+
+        while (true) {
+            const page = await this.prisma.costLog.findMany({
+                where,
+                select: COST_EXPORT_SELECT,
+                orderBy: [{ createdAt: 'asc' }, { id: 'asc' }],
+                take: pageSize,
+                ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {})
+            });
+
+            yield* page;
+
+            if (page.length < pageSize) return;
+            cursor = page[page.length - 1].id;
+        }
+    }
+
     /**
      * Set budget for a user
      */
@@ -305,36 +382,26 @@ export class CostTracker {
      * Check budget limits
      */
     private async checkBudgetLimits(userId: string, newCost: number): Promise<void> {
-        // Get active budgets for user
-        const now = new Date();
-        const dailyStart = new Date(now.getFullYear(), now.getMonth(), now.getDate());
-        const weeklyStart = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-        const monthlyStart = new Date(now.getFullYear(), now.getMonth(), 1);
+        // Get active budgets for user first; without any there is no spend to compare against
+        const budgets = (await this.getUserBudgets(userId)).filter(budget => budget.isActive);
+        if (budgets.length === 0) return;
 
-        // Calculate current spending for each period
-        const dailySpend = await this.getCurrentSpend(userId, dailyStart, now);
-        const weeklySpend = await this.getCurrentSpend(userId, weeklyStart, now);
-        const monthlySpend = await this.getCurrentSpend(userId, monthlyStart, now);
+        const now = new Date();
+        const periodStarts: Record<CostBudget['budgetType'], Date> = {
+            daily: new Date(now.getFullYear(), now.getMonth(), now.getDate()),
+            weekly: new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000),
+            monthly: new Date(now.getFullYear(), now.getMonth(), 1)
+        };
 
-        // Check against budgets (this would be from database in real implementation)
-        const budgets = await this.getUserBudgets(userId);
+        // Calculate current spending only for the periods that have a budget, concurrently
+        const budgetTypes = Array.from(new Set(budgets.map(budget => budget.budgetType)));
+        const spends = await Promise.all(
+            budgetTypes.map(budgetType => this.getCurrentSpend(userId, periodStarts[budgetType], now))
+        );
+        const spendByType = new Map(budgetTypes.map((budgetType, index) => [budgetType, spends[index]]));
 
         for (const budget of budgets) {
-            if (!budget.isActive) continue;
-
-            let currentSpend = 0;
-            switch (budget.budgetType) {
-                case 'daily':
-                    currentSpend = dailySpend;
-                    break;
-                case 'weekly':
-                    currentSpend = weeklySpend;
-                    break;
-                case 'monthly':
-                    currentSpend = monthlySpend;
-                    break;
-            }
-
+            const currentSpend = spendByType.get(budget.budgetType) ?? 0;
             const projectedSpend = currentSpend + newCost;
             const percentage = (projectedSpend / budget.amount) * 100;
 
@@ -384,7 +451,8 @@ export class CostTracker {
 
         try {
             // Convert to Prisma format and insert
-            const prismaData = costs.map(cost => ({
+            const prismaData = costs.map((cost): Prisma.CostLogCreateManyInput => ({
+                id: cost.id,
                 userId: cost.userId,
                 chatId: cost.chatId || null, // Allow null chatId
                 operation: cost.operation,
@@ -393,8 +461,10 @@ export class CostTracker {
                 inputTokens: cost.inputTokens,
                 outputTokens: cost.outputTokens,
                 totalTokens: cost.totalTokens,
-                costUsd: cost.totalCost,
-                metadata: cost.metadata ? JSON.stringify(cost.metadata) : null,
+                costUsd: cost.totalCost.toFixed(COST_USD_SCALE),
+                // Passed as an object: Prisma encodes it once into the jsonb column, where a pre-stringified
+                // value would be encoded a second time and stored as a JSON string instead of an object
+                metadata: (cost.metadata ?? undefined) as Prisma.InputJsonValue | undefined,
                 createdAt: cost.timestamp
             }));
 
@@ -405,7 +475,7 @@ export class CostTracker {
             });
 
             // Further filter to only include records with valid chatId or null chatId
-            const safeData = validData.filter(cost => {
+            const safeData: Prisma.CostLogCreateManyInput[] = validData.filter(cost => {
                 if (cost.chatId) {
                     // If chatId is provided, we need to verify it exists
                     // For now, we'll skip records with chatId to avoid foreign key issues
@@ -415,17 +485,7 @@ export class CostTracker {
             });
 
             if (safeData.length > 0) {
-                // Use individual inserts to handle foreign key constraints gracefully
-                for (const cost of safeData) {
-                    try {
-                        await this.prisma.costLog.create({
-                            data: cost as any
-                        });
-                    } catch (error) {
-                        console.warn('Failed to insert individual cost log:', error);
-                        // Continue with other records
-                    }
-                }
+                await this.insertCostLogs(safeData);
             }
 
         } catch (error) {
@@ -441,6 +501,55 @@ export class CostTracker {
         }
     }
 
+    /**
+     * Insert cost rows in a single multi-row statement
+     * Falls back to per-row inserts when the batch fails, so one row with a bad foreign key doesn't drop the rest
+     */
+    private async insertCostLogs(rows: Prisma.CostLogCreateManyInput[]): Promise<void> {
+        try {
+            await this.ensureUsersExist(rows.map(row => row.userId));
+            // Rows carry their queue-assigned ids, so a re-queued batch can't be written twice
+            await this.prisma.costLog.createMany({ data: rows, skipDuplicates: true });
+            return;
+        } catch (error) {
+            console.warn('Batch cost log insert failed, retrying rows individually:', error);
+        }
+
+        for (const cost of rows) {
+            try {
+                await this.prisma.costLog.create({
+                    data: cost
+                });
+            } catch (error) {
+                console.warn('Failed to insert individual cost log:', error);
+                // Continue with other records
+            }
+        }
+    }
+
+    /**
+     * Make sure every user referenced by a cost batch exists
+     * Unseen users are created with one INSERT ... ON CONFLICT DO NOTHING rather than looked up one by one
+     */
+    private async ensureUsersExist(userIds: string[]): Promise<void> {
+        const unknownUserIds = Array.from(new Set(userIds)).filter(userId => !this.knownUserIds.has(userId));
+        if (unknownUserIds.length === 0) return;
+
+        await this.prisma.user.createMany({
+            data: unknownUserIds.map(userId => ({
+                id: userId,
+                email: `user-${userId}@example.com`,
+                name: 'Medical User'
+            })),
+            skipDuplicates: true
+        });
+
+        if (this.knownUserIds.size + unknownUserIds.length > KNOWN_USERS_MAX_ENTRIES) {
+            this.knownUserIds.clear();
+        }
+        unknownUserIds.forEach(userId => this.knownUserIds.add(userId));
+    }
+
     /**
      * Start the flush timer
      */
@@ -462,11 +571,11 @@ export class CostTracker {
 
     /**
      * Cleanup and flush remaining costs
+     * The Prisma client is shared with the API routes, so it is left connected
      */
     public async cleanup(): Promise<void> {
         this.stopFlushTimer();
         await this.flushCosts();
-        await this.prisma.$disconnect();
     }
 
     private isCriticalOperation(operation: Operation): boolean {
@@ -477,27 +586,6 @@ export class CostTracker {
         ].includes(operation);
     }
 
-    private generateDailyCosts(
-        costLogs: any[],
-        startDate: Date,
-        endDate: Date
-    ): Array<{ date: string; cost: number; requests: number }> {
-        const dailyMap = new Map<string, { cost: number; requests: number }>();
-
-        costLogs.forEach(log => {
-            const date = log.createdAt.toISOString().split('T')[0];
-            const existing = dailyMap.get(date) || { cost: 0, requests: 0 };
-            existing.cost += Number(log.costUsd);
-            existing.requests += 1;
-            dailyMap.set(date, existing);
-        });
-
-        return Array.from(dailyMap.entries()).map(([date, data]) => ({
-            date,
-            ...data
-        }));
-    }
-
     private async getUserBudgets(userId: string): Promise<CostBudget[]> {
         // Placeholder - would fetch from database
         return [];
@@ -0,0 +1,25 @@
+/**
+ * Primary Key Generation
+ * Time-ordered UUIDs for rows whose ids are generated in the application
+ */
+
+/**
+ * Generate a UUIDv7 (RFC 9562): 48-bit Unix millisecond timestamp followed by random bits
+ * Ids sort by creation time, so inserts append to the end of the primary-key index instead of landing on random pages
+ */
+export function uuidv7(): string {
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    const timestamp = Date.now();
+
+    bytes[0] = Math.floor(timestamp / 2 ** 40) & 0xff;
+    bytes[1] = Math.floor(timestamp / 2 ** 32) & 0xff;
+    bytes[2] = (timestamp >>> 24) & 0xff;
+    bytes[3] = (timestamp >>> 16) & 0xff;
+    bytes[4] = (timestamp >>> 8) & 0xff;
+    bytes[5] = timestamp & 0xff;
+    bytes[6] = (bytes[6] & 0x0f) | 0x70; // version 7
+    bytes[8] = (bytes[8] & 0x3f) | 0x80; // RFC 9562 variant
+
+    const hex = Array.from(bytes, byte => byte.toString(16).padStart(2, '0')).join('');
+    return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
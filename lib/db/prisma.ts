@@ -0,0 +1,62 @@
+/**
+ * Shared Prisma Client
+ * One client, and so one warm connection pool, per process for every route and service
+ */
+
+import { PrismaClient } from '@prisma/client';
+
+// Next.js dev reloads re-evaluate route modules; keeping the client on globalThis lets each
+// reload reuse the open pool instead of leaking a new one
+const globalForPrisma = globalThis as unknown as { prisma?: PrismaClient };
+
+// Operations that only read, and so can be replayed safely after the connection dropped mid-query
+const READ_OPERATIONS = new Set([
+    'findUnique', 'findUniqueOrThrow', 'findFirst', 'findFirstOrThrow', 'findMany',
+    'count', 'aggregate', 'groupBy', '$queryRaw', '$queryRawUnsafe'
+]);
+
+/**
+ * Whether a failed query can be retried on a fresh connection
+ * P1001 (can't reach the server) means nothing ran, so any operation may retry; P1017 (server closed
+ * the connection) can arrive after a write was applied, so only reads retry
+ */
+function isRetryableDisconnect(operation: string, error: unknown): boolean {
+    const { code, errorCode } = (error ?? {}) as { code?: string; errorCode?: string };
+    const prismaCode = code ?? errorCode;
+    return prismaCode === 'P1001' || (prismaCode === 'P1017' && READ_OPERATIONS.has(operation));
+}
+
+/**
+ * Create the client with a single retry for queries that hit a stale connection
+ * Checkouts are never pinged up front; the rare dropped connection is handled here instead
+ */
+function createPrismaClient(): PrismaClient {
+    const prisma = new PrismaClient().$extends({
+        query: {
+            async $allOperations({ model, operation, args, query }) {
+                try {
+                    return await query(args);
+                } catch (error) {
+                    if (!isRetryableDisconnect(operation, error)) {
+                        throw error;
+                    }
+                    console.warn(`⚠️ Database connection lost during ${model ?? 'raw'}.${operation}, retrying once`);
+                    return query(args);
+                }
+            }
+        }
+    });
+
+    // A query extension leaves every model method's signature unchanged, so callers keep the PrismaClient type
+    return prisma as unknown as PrismaClient;
+}
+
+/**
+ * Get the shared Prisma client, creating it on first use
+ */
+export function getPrismaClient(): PrismaClient {
+    if (!globalForPrisma.prisma) {
+        globalForPrisma.prisma = createPrismaClient();
+    }
+    return globalForPrisma.prisma;
+}
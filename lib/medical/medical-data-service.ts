@@ -9,108 +9,113 @@
  */
 
 import { PrismaClient } from '@prisma/client';
-import { getQdrantService, SearchResult } from '../vector/qdrant-service';
+import { getQdrantService, SearchResult, SearchTuning } from '../vector/qdrant-service';
 import { modelRepository } from '../models/repository';
 import { costTracker } from '../cost-tracking/tracker';
 import { Operation } from '../cost-tracking/types';
+import {
+    MedicalDocument,
+    SessionDocument,
+    MedicalQueryRequest,
+    MedicalQueryResponse,
+    MedicalContext,
+    MedicalCitation,
+    MedicalCategory
+} from './types';
+
+export * from './types';
+
+// Global knowledge matches depend only on the query text, so repeated questions reuse them
+const GLOBAL_MATCH_CACHE_TTL_MS = 5 * 60 * 1000;
+const GLOBAL_MATCH_CACHE_MAX_ENTRIES = 256;
+
+// Keyword tables for tagging and category detection, built once at module load
+const MEDICAL_TAG_TERMS: readonly string[] = [
+    // Symptoms
+    'fever', 'pain', 'headache', 'nausea', 'fatigue', 'dizziness', 'shortness of breath',
+    'chest pain', 'abdominal pain', 'back pain', 'joint pain', 'muscle pain',
+
+    // Conditions  
+    'diabetes', 'hypertension', 'heart disease', 'cancer', 'stroke', 'pneumonia',
+    'covid-19', 'flu', 'asthma', 'arthritis', 'depression', 'anxiety',
+
+    // Treatments
+    'medication', 'surgery', 'therapy', 'treatment', 'prescription', 'dose',
+    'antibiotic', 'vaccine', 'chemotherapy', 'radiation', 'physical therapy',
+
+    // Body systems
+    'cardiovascular', 'respiratory', 'neurological', 'gastrointestinal', 'endocrine',
+    'musculoskeletal', 'dermatological', 'psychiatric', 'renal', 'hepatic',
+
+    // Tests and procedures
+    'blood test', 'x-ray', 'mri', 'ct scan', 'ultrasound', 'biopsy', 'ecg', 'ekg'
+];
+
+const CATEGORY_KEYWORDS: ReadonlyArray<readonly [string, readonly string[]]> = [
+    [MedicalCategory.SYMPTOMS, ['symptom', 'feel', 'pain', 'ache', 'hurt', 'sick']],
+    [MedicalCategory.DISEASES, ['disease', 'condition', 'syndrome', 'disorder']],
+    [MedicalCategory.TREATMENTS, ['treatment', 'therapy', 'cure', 'heal', 'remedy']],
+    [MedicalCategory.MEDICATIONS, ['medication', 'drug', 'pill', 'prescription', 'dose']],
+    [MedicalCategory.DIAGNOSIS, ['diagnose', 'test', 'exam', 'check', 'scan']],
+    [MedicalCategory.PREVENTION, ['prevent', 'avoid', 'protect', 'reduce risk']]
+];
+
+const MAX_MEDICAL_TAGS = 10;
 
-// Types for medical data handling
-export interface MedicalDocument {
-    id: string;
-    title: string;
-    content: string;
-    category: MedicalCategory;
-    source: string;
-    specialty?: MedicalSpecialty;
-    trustScore?: number;
-    metadata?: Record<string, any>;
-}
-
-export interface SessionDocument {
-    id: string;
-    sessionId: string;
-    userId: string;
-    fileName: string;
-    content: string;
-    extractedText: string;
-    fileType: string;
-    metadata?: Record<string, any>;
-}
-
-export interface MedicalQueryRequest {
-    query: string;
-    userId: string;
-    sessionId: string;
-    useGlobalKnowledge?: boolean;
-    useSessionDocuments?: boolean;
-    medicalContext?: MedicalContext;
-    uploadedDocuments?: Array<{
-        id: string;
-        fileName: string;
-        content: string;
-    }>;
-}
+/**
+ * Collect the terms found in the text, in table order, stopping once the tag limit is reached
+ */
+export function findMedicalTags(text: string, terms: readonly string[], limit: number = MAX_MEDICAL_TAGS): string[] {
+    const lowerText = text.toLowerCase();
+    const found: string[] = [];
+
+    for (const term of terms) {
+        if (lowerText.includes(term)) {
+            found.push(term);
+            if (found.length >= limit) break;
+        }
+    }
 
-export interface MedicalQueryResponse {
-    globalMatches: SearchResult[];
-    sessionMatches: SearchResult[];
-    combinedResponse: string;
-    confidence: number;
-    citations: MedicalCitation[];
-    cost: number;
+    return found;
 }
 
-export interface MedicalContext {
-    patientAge?: number;
-    patientGender?: 'male' | 'female' | 'other';
-    medicalHistory?: string[];
-    currentSymptoms?: string[];
-    specialty?: MedicalSpecialty;
-}
+// Oversample quantized knowledge hits, then rescore them against the full-precision vectors
+const KNOWLEDGE_SEARCH_TUNING: SearchTuning = { rescore: true, oversampling: 2 };
 
-export interface MedicalCitation {
-    id: string;
-    title: string;
-    source: string;
-    url?: string;
-    relevanceScore: number;
-    trustScore: number;
-    snippet: string;
-    category: MedicalCategory;
-}
+// Knowledge ingestion embeds documents in batches bounded by an approximate token budget
+const EMBEDDING_BATCH_TOKEN_BUDGET = 8192;
+const APPROX_CHARS_PER_TOKEN = 4;
 
-export enum MedicalCategory {
-    SYMPTOMS = 'symptoms',
-    DISEASES = 'diseases',
-    TREATMENTS = 'treatments',
-    MEDICATIONS = 'medications',
-    PROCEDURES = 'procedures',
-    PREVENTION = 'prevention',
-    DIAGNOSIS = 'diagnosis',
-    ANATOMY = 'anatomy',
-    PHARMACOLOGY = 'pharmacology',
-    PATHOLOGY = 'pathology',
-    GENERAL = 'general'
-}
+/**
+ * Greedily pack items into batches whose approximate token count stays within the budget
+ * An item larger than the budget gets a batch of its own
+ */
+function buildTokenBudgetBatches<T>(items: T[], getText: (item: T) => string, maxTokens: number): T[][] {
+    const batches: T[][] = [];
+    let current: T[] = [];
+    let currentTokens = 0;
+
+    for (const item of items) {
+        const tokens = Math.ceil(getText(item).length / APPROX_CHARS_PER_TOKEN);
+        if (current.length > 0 && currentTokens + tokens > maxTokens) {
+            batches.push(current);
+            current = [];
+            currentTokens = 0;
+        }
+        current.push(item);
+        currentTokens += tokens;
+    }
 
-export enum MedicalSpecialty {
-    CARDIOLOGY = 'cardiology',
-    NEUROLOGY = 'neurology',
-    ONCOLOGY = 'oncology',
-    PEDIATRICS = 'pediatrics',
-    PSYCHIATRY = 'psychiatry',
-    SURGERY = 'surgery',
-    DERMATOLOGY = 'dermatology',
-    ENDOCRINOLOGY = 'endocrinology',
-    GASTROENTEROLOGY = 'gastroenterology',
-    PULMONOLOGY = 'pulmonology',
-    RADIOLOGY = 'radiology',
-    GENERAL = 'general'
+    if (current.length > 0) {
+        batches.push(current);
+    }
+    return batches;
 }
 
 export class MedicalDataService {
     private prisma: PrismaClient;
     private qdrant: ReturnType<typeof getQdrantService>;
+    private globalMatchCache: Map<string, { value: SearchResult[]; expiresAt: number }> = new Map();
 
     constructor(prisma: PrismaClient) {
         this.prisma = prisma;
@@ -127,28 +132,55 @@ export class MedicalDataService {
         let ingested = 0;
 
         try {
-            for (const doc of documents) {
+            const batches = buildTokenBudgetBatches(documents, doc => doc.content, EMBEDDING_BATCH_TOKEN_BUDGET);
+
+            // Embed one batch ahead so the next batch's embeddings overlap the current batch's writes
+            let nextEmbeddings = batches.length > 0 ? this.prefetchEmbeddings(batches[0]) : undefined;
+
+            for (let index = 0; index < batches.length; index++) {
+                const batch = batches[index];
+                const embeddingsPromise = nextEmbeddings!;
+                nextEmbeddings = index + 1 < batches.length ? this.prefetchEmbeddings(batches[index + 1]) : undefined;
+
+                let embeddings: number[][];
                 try {
-                    // Generate embedding for the document
-                    const embedding = await this.generateEmbedding(doc.content);
-
-                    // Store in vector database (knowledge collection)
-                    await this.qdrant.storeKnowledgeVector(doc.id, embedding, {
-                        content: doc.content,
-                        title: doc.title,
-                        category: doc.category,
-                        source: doc.source,
-                        tags: this.extractMedicalTags(doc.content),
-                        trustScore: doc.trustScore || 0.8,
-                        metadata: {
-                            ...doc.metadata,
-                            specialty: doc.specialty,
-                            ingestionDate: new Date().toISOString()
+                    embeddings = await embeddingsPromise;
+                } catch (error) {
+                    this.recordBatchFailure(batch, error, errors);
+                    continue;
+                }
+
+                const tags = batch.map(doc => this.extractMedicalTags(doc.content));
+                const ingestionDate = new Date().toISOString();
+
+                // Store in vector database (knowledge collection), one upsert per batch; the next batch's
+                // embeddings keep generating meanwhile
+                try {
+                    await this.qdrant.storeKnowledgeVectors(batch.map((doc, i) => ({
+                        id: doc.id,
+                        vector: embeddings[i],
+                        payload: {
+                            content: doc.content,
+                            title: doc.title,
+                            category: doc.category,
+                            source: doc.source,
+                            tags: tags[i],
+                            trustScore: doc.trustScore || 0.8,
+                            metadata: {
+                                ...doc.metadata,
+                                specialty: doc.specialty,
+                                ingestionDate
+                            }
                         }
-                    });
+                    })));
+                } catch (error) {
+                    this.recordBatchFailure(batch, error, errors);
+                    continue;
+                }
 
-                    // Store in PostgreSQL for metadata
-                    await this.prisma.medicalKnowledge.upsert({
+                // Store in PostgreSQL for metadata, only once the vectors the rows point at exist
+                const recordResults = await Promise.allSettled(
+                    batch.map((doc, i) => this.prisma.medicalKnowledge.upsert({
                         where: { id: doc.id },
                         update: {
                             title: doc.title,
@@ -169,16 +201,19 @@ export class MedicalDataService {
                             specialty: doc.specialty,
                             trustScore: doc.trustScore,
                             vectorId: doc.id,
-                            tags: this.extractMedicalTags(doc.content)
-                        }
-                    });
+                            tags: tags[i]
+                        },
+                        select: { id: true }
+                    }))
+                );
 
-                    ingested++;
-                } catch (error) {
-                    const errorMsg = `Failed to ingest document ${doc.id}: ${error instanceof Error ? error.message : 'Unknown error'}`;
-                    errors.push(errorMsg);
-                    console.error(errorMsg);
-                }
+                recordResults.forEach((result, i) => {
+                    if (result.status === 'fulfilled') {
+                        ingested++;
+                    } else {
+                        this.recordBatchFailure([batch[i]], result.reason, errors);
+                    }
+                });
             }
 
             return { success: errors.length === 0, ingested, errors };
@@ -202,70 +237,16 @@ export class MedicalDataService {
         document: SessionDocument
     ): Promise<{ success: boolean; vectorId?: string; error?: string }> {
         try {
-            // Generate embedding for the document
-            const embedding = await this.generateEmbedding(document.content);
-
-            // Store in vector database (files collection)
-            await this.qdrant.storeFileVector(document.id, embedding, {
-                content: document.content,
-                title: document.fileName,
-                sessionId,
-                userId,
-                fileType: document.fileType,
-                tags: this.extractMedicalTags(document.content),
-                metadata: {
-                    ...document.metadata,
-                    originalFileName: document.fileName,
-                    ingestionDate: new Date().toISOString(),
-                    extractedTextLength: document.extractedText.length
-                }
-            });
+            const tags = this.extractMedicalTags(document.content);
 
-            // Ensure user exists before creating session
-            await this.prisma.user.upsert({
-                where: { id: userId },
-                update: {},
-                create: {
-                    id: userId,
-                    email: `user-${userId}@example.com`,
-                    name: 'Medical User'
-                }
-            });
-
-            // Ensure session exists before creating session file
-            await this.prisma.session.upsert({
-                where: { id: sessionId },
-                update: { updatedAt: new Date() },
-                create: {
-                    id: sessionId,
-                    userId,
-                    title: `Session with ${document.fileName}`,
-                    isActive: true
-                }
-            });
+            // The session upsert doesn't depend on the vector, so it overlaps the embedding and vector write
+            await Promise.all([
+                this.storeSessionDocumentVector(sessionId, userId, document, tags),
+                this.ensureDocumentSession(sessionId, userId, document)
+            ]);
 
-            // Create or update session file record with vector ID
-            await this.prisma.sessionFile.upsert({
-                where: { id: document.id },
-                update: {
-                    vectorId: document.id,
-                    processingStatus: 'COMPLETED',
-                    extractedText: document.extractedText,
-                    tags: this.extractMedicalTags(document.content)
-                },
-                create: {
-                    id: document.id,
-                    sessionId,
-                    fileName: document.fileName,
-                    fileType: document.fileType,
-                    fileSize: document.metadata?.fileSize || 0,
-                    vectorId: document.id,
-                    processingStatus: 'COMPLETED',
-                    extractedText: document.extractedText,
-                    tags: this.extractMedicalTags(document.content),
-                    metadata: document.metadata || {}
-                }
-            });
+            // The file row is recorded only after its vector is stored, so it never points at a missing vector
+            await this.saveSessionFileRecord(sessionId, document, tags);
 
             return { success: true, vectorId: document.id };
 
@@ -282,21 +263,17 @@ export class MedicalDataService {
      * Query medical knowledge using dual RAG
      */
     async queryMedicalKnowledge(request: MedicalQueryRequest): Promise<MedicalQueryResponse> {
-        const startTime = Date.now();
+        const startTime = performance.now();
 
         try {
-            // Generate embedding for the query
-            const queryEmbedding = await this.generateEmbedding(request.query);
+            // Embed the query on first use, so a cached global search with no session documents skips it
+            let queryEmbedding: Promise<number[]> | undefined;
+            const embedQuery = () => (queryEmbedding ??= this.generateEmbedding(request.query));
 
             // Search global knowledge base (if enabled)
             let globalMatches: SearchResult[] = [];
             if (request.useGlobalKnowledge !== false) {
-                globalMatches = await this.qdrant.searchKnowledge(queryEmbedding, {
-                    limit: 5,
-                    scoreThreshold: 0.75,
-                    category: this.detectMedicalCategory(request.query),
-                    minTrustScore: 0.7
-                });
+                globalMatches = await this.searchGlobalKnowledge(request.query, embedQuery);
             }
 
             // Search session-specific documents (if enabled)
@@ -304,11 +281,13 @@ export class MedicalDataService {
             if (request.useSessionDocuments !== false) {
                 // First, search existing indexed documents
                 sessionMatches = await this.qdrant.searchFiles(
-                    queryEmbedding,
+                    await embedQuery(),
                     request.sessionId,
                     {
                         limit: 3,
-                        scoreThreshold: 0.7
+                        scoreThreshold: 0.7,
+                        // Chat turns arrive concurrently; batch their searches into one Qdrant request
+                        coalesce: true
                     }
                 );
 
@@ -319,7 +298,7 @@ export class MedicalDataService {
                     const uploadedMatches = await this.searchUploadedDocuments(
                         request.query,
                         request.uploadedDocuments,
-                        queryEmbedding
+                        await embedQuery()
                     );
 
                     // Combine with existing session matches
@@ -342,7 +321,7 @@ export class MedicalDataService {
             const confidence = this.calculateResponseConfidence(globalMatches, sessionMatches);
 
             // Track cost
-            const processingTime = Date.now() - startTime;
+            const processingTime = Math.round(performance.now() - startTime);
             const estimatedCost = 0.001 + (processingTime / 1000) * 0.0001; // Basic cost estimation
 
             await costTracker.trackCost({
@@ -474,6 +453,134 @@ export class MedicalDataService {
 
     // Private helper methods
 
+    /**
+     * Search the global knowledge base, serving repeated queries from a short-lived cache
+     * The cache is keyed on the normalized query text and filters, so a hit never needs the embedding
+     */
+    private async searchGlobalKnowledge(query: string, embedQuery: () => Promise<number[]>): Promise<SearchResult[]> {
+        const category = this.detectMedicalCategory(query);
+        // Normalize so case, spacing and trailing punctuation variants share an entry
+        const cacheKey = `${query.toLowerCase().replace(/\s+/g, ' ').replace(/[\s?.!]+$/, '').trim()}\u0000${category ?? ''}`;
+
+        const cached = this.globalMatchCache.get(cacheKey);
+        if (cached && cached.expiresAt > Date.now()) {
+            return cached.value;
+        }
+
+        const matches = await this.qdrant.searchKnowledge(await embedQuery(), {
+            limit: 5,
+            scoreThreshold: 0.75,
+            category,
+            minTrustScore: 0.7,
+            coalesce: true,
+            // Rescore the quantized candidates with the original vectors so the 0.75 threshold stays exact
+            tuning: KNOWLEDGE_SEARCH_TUNING
+        });
+
+        this.globalMatchCache.delete(cacheKey);
+        this.globalMatchCache.set(cacheKey, { value: matches, expiresAt: Date.now() + GLOBAL_MATCH_CACHE_TTL_MS });
+        if (this.globalMatchCache.size > GLOBAL_MATCH_CACHE_MAX_ENTRIES) {
+            // Map iteration order is insertion order, so the first key is the oldest entry
+            const oldestKey = this.globalMatchCache.keys().next().value;
+            if (oldestKey !== undefined) {
+                this.globalMatchCache.delete(oldestKey);
+            }
+        }
+
+        return matches;
+    }
+
+    /**
+     * Embed a session document and store it in the files collection
+     */
+    private async storeSessionDocumentVector(
+        sessionId: string,
+        userId: string,
+        document: SessionDocument,
+        tags: string[]
+    ): Promise<void> {
+        // Generate embedding for the document
+        const embedding = await this.generateEmbedding(document.content);
+
+        // Store in vector database (files collection)
+        await this.qdrant.storeFileVector(document.id, embedding, {
+            content: document.content,
+            title: document.fileName,
+            sessionId,
+            userId,
+            fileType: document.fileType,
+            tags,
+            metadata: {
+                ...document.metadata,
+                originalFileName: document.fileName,
+                ingestionDate: new Date().toISOString(),
+                extractedTextLength: document.extractedText.length
+            }
+        });
+    }
+
+    /**
+     * Ensure the document's session (and its user) exists, in one upsert
+     */
+    private async ensureDocumentSession(
+        sessionId: string,
+        userId: string,
+        document: SessionDocument
+    ): Promise<void> {
+        await this.prisma.session.upsert({
+            where: { id: sessionId },
+            update: { updatedAt: new Date() },
+            select: { id: true },
+            create: {
+                id: sessionId,
+                title: `Session with ${document.fileName}`,
+                isActive: true,
+                user: {
+                    connectOrCreate: {
+                        where: { id: userId },
+                        create: {
+                            id: userId,
+                            email: `user-${userId}@example.com`,
+                            name: 'Medical User'
+                        }
+                    }
+                }
+            }
+        });
+    }
+
+    /**
+     * Record a session document whose vector has been stored
+     */
+    private async saveSessionFileRecord(
+        sessionId: string,
+        document: SessionDocument,
+        tags: string[]
+    ): Promise<void> {
+        // Create or update session file record with vector ID
+        await this.prisma.sessionFile.upsert({
+            where: { id: document.id },
+            update: {
+                vectorId: document.id,
+                processingStatus: 'COMPLETED',
+                extractedText: document.extractedText,
+                tags
+            },
+            create: {
+                id: document.id,
+                sessionId,
+                fileName: document.fileName,
+                fileType: document.fileType,
+                fileSize: document.metadata?.fileSize || 0,
+                vectorId: document.id,
+                processingStatus: 'COMPLETED',
+                extractedText: document.extractedText,
+                tags,
+                metadata: document.metadata || {}
+            }
+        });
+    }
+
     private async generateEmbedding(text: string): Promise<number[]> {
         try {
             // For now, create a mock embedding - in production, this would use OpenAI embeddings API
@@ -485,33 +592,36 @@ export class MedicalDataService {
         }
     }
 
-    private extractMedicalTags(content: string): string[] {
-        const medicalTerms = [
-            // Symptoms
-            'fever', 'pain', 'headache', 'nausea', 'fatigue', 'dizziness', 'shortness of breath',
-            'chest pain', 'abdominal pain', 'back pain', 'joint pain', 'muscle pain',
-
-            // Conditions  
-            'diabetes', 'hypertension', 'heart disease', 'cancer', 'stroke', 'pneumonia',
-            'covid-19', 'flu', 'asthma', 'arthritis', 'depression', 'anxiety',
-
-            // Treatments
-            'medication', 'surgery', 'therapy', 'treatment', 'prescription', 'dose',
-            'antibiotic', 'vaccine', 'chemotherapy', 'radiation', 'physical therapy',
-
-            // Body systems
-            'cardiovascular', 'respiratory', 'neurological', 'gastrointestinal', 'endocrine',
-            'musculoskeletal', 'dermatological', 'psychiatric', 'renal', 'hepatic',
+    private async generateEmbeddings(texts: string[]): Promise<number[][]> {
+        try {
+            // For now, create mock embeddings - in production, this would send the whole batch in one OpenAI embeddings request
+            return texts.map(() => Array.from({ length: 1536 }, () => Math.random() - 0.5));
+        } catch (error) {
+            console.error('Embedding generation failed:', error);
+            throw new Error('Failed to generate embeddings');
+        }
+    }
 
-            // Tests and procedures
-            'blood test', 'x-ray', 'mri', 'ct scan', 'ultrasound', 'biopsy', 'ecg', 'ekg'
-        ];
+    /**
+     * Start embedding a batch of documents ahead of use without surfacing an unhandled rejection;
+     * awaiting the returned promise still throws
+     */
+    private prefetchEmbeddings(documents: MedicalDocument[]): Promise<number[][]> {
+        const embeddings = this.generateEmbeddings(documents.map(doc => doc.content));
+        embeddings.catch(() => undefined);
+        return embeddings;
+    }
 
-        const lowerContent = content.toLowerCase();
-        const foundTerms = medicalTerms.filter(term => lowerContent.includes(term));
+    private recordBatchFailure(documents: MedicalDocument[], error: unknown, errors: string[]): void {
+        for (const doc of documents) {
+            const errorMsg = `Failed to ingest document ${doc.id}: ${error instanceof Error ? error.message : 'Unknown error'}`;
+            errors.push(errorMsg);
+            console.error(errorMsg);
+        }
+    }
 
-        // Remove duplicates and limit to 10 tags
-        return [...new Set(foundTerms)].slice(0, 10);
+    private extractMedicalTags(content: string): string[] {
+        return findMedicalTags(content, MEDICAL_TAG_TERMS);
     }
 
     /**
@@ -587,18 +697,9 @@ export class MedicalDataService {
     }
 
     private detectMedicalCategory(query: string): string | undefined {
-        const categoryKeywords = {
-            [MedicalCategory.SYMPTOMS]: ['symptom', 'feel', 'pain', 'ache', 'hurt', 'sick'],
-            [MedicalCategory.DISEASES]: ['disease', 'condition', 'syndrome', 'disorder'],
-            [MedicalCategory.TREATMENTS]: ['treatment', 'therapy', 'cure', 'heal', 'remedy'],
-            [MedicalCategory.MEDICATIONS]: ['medication', 'drug', 'pill', 'prescription', 'dose'],
-            [MedicalCategory.DIAGNOSIS]: ['diagnose', 'test', 'exam', 'check', 'scan'],
-            [MedicalCategory.PREVENTION]: ['prevent', 'avoid', 'protect', 'reduce risk']
-        };
-
         const lowerQuery = query.toLowerCase();
 
-        for (const [category, keywords] of Object.entries(categoryKeywords)) {
+        for (const [category, keywords] of CATEGORY_KEYWORDS) {
             if (keywords.some(keyword => lowerQuery.includes(keyword))) {
                 return category;
             }
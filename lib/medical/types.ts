@@ -0,0 +1,99 @@
+/**
+ * Medical Data Types
+ * Shared contracts for the dual RAG system, free of service-layer side effects
+ */
+
+import type { SearchResult } from '../vector/qdrant-service';
+
+export interface MedicalDocument {
+    id: string;
+    title: string;
+    content: string;
+    category: MedicalCategory;
+    source: string;
+    specialty?: MedicalSpecialty;
+    trustScore?: number;
+    metadata?: Record<string, any>;
+}
+
+export interface SessionDocument {
+    id: string;
+    sessionId: string;
+    userId: string;
+    fileName: string;
+    content: string;
+    extractedText: string;
+    fileType: string;
+    metadata?: Record<string, any>;
+}
+
+export interface MedicalQueryRequest {
+    query: string;
+    userId: string;
+    sessionId: string;
+    useGlobalKnowledge?: boolean;
+    useSessionDocuments?: boolean;
+    medicalContext?: MedicalContext;
+    uploadedDocuments?: Array<{
+        id: string;
+        fileName: string;
+        content: string;
+    }>;
+}
+
+export interface MedicalQueryResponse {
+    globalMatches: SearchResult[];
+    sessionMatches: SearchResult[];
+    combinedResponse: string;
+    confidence: number;
+    citations: MedicalCitation[];
+    cost: number;
+}
+
+export interface MedicalContext {
+    patientAge?: number;
+    patientGender?: 'male' | 'female' | 'other';
+    medicalHistory?: string[];
+    currentSymptoms?: string[];
+    specialty?: MedicalSpecialty;
+}
+
+export interface MedicalCitation {
+    id: string;
+    title: string;
+    source: string;
+    url?: string;
+    relevanceScore: number;
+    trustScore: number;
+    snippet: string;
+    category: MedicalCategory;
+}
+
+export enum MedicalCategory {
+    SYMPTOMS = 'symptoms',
+    DISEASES = 'diseases',
+    TREATMENTS = 'treatments',
+    MEDICATIONS = 'medications',
+    PROCEDURES = 'procedures',
+    PREVENTION = 'prevention',
+    DIAGNOSIS = 'diagnosis',
+    ANATOMY = 'anatomy',
+    PHARMACOLOGY = 'pharmacology',
+    PATHOLOGY = 'pathology',
+    GENERAL = 'general'
+}
+
+export enum MedicalSpecialty {
+    CARDIOLOGY = 'cardiology',
+    NEUROLOGY = 'neurology',
+    ONCOLOGY = 'oncology',
+    PEDIATRICS = 'pediatrics',
+    PSYCHIATRY = 'psychiatry',
+    SURGERY = 'surgery',
+    DERMATOLOGY = 'dermatology',
+    ENDOCRINOLOGY = 'endocrinology',
+    GASTROENTEROLOGY = 'gastroenterology',
+    PULMONOLOGY = 'pulmonology',
+    RADIOLOGY = 'radiology',
+    GENERAL = 'general'
+}
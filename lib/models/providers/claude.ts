@@ -20,6 +20,10 @@ import {
     ModelProviderError
 } from '../types';
 
+// Claude 3.5 Sonnet pricing (as of 2024), per token
+const INPUT_COST_PER_TOKEN = 0.000003; // $3 per 1M tokens
+const OUTPUT_COST_PER_TOKEN = 0.000015; // $15 per 1M tokens
+
 export class ClaudeProvider implements AIModelProvider {
     name = 'anthropic';
     models = [
@@ -173,12 +177,8 @@ export class ClaudeProvider implements AIModelProvider {
     }
 
     calculateCost(usage: ModelResponse['usage']): CostInfo {
-        // Claude 3.5 Sonnet pricing (as of 2024)
-        const inputCostPerToken = 0.000003; // $3 per 1M tokens
-        const outputCostPerToken = 0.000015; // $15 per 1M tokens
-
-        const inputCost = usage.promptTokens * inputCostPerToken;
-        const outputCost = usage.completionTokens * outputCostPerToken;
+        const inputCost = usage.promptTokens * INPUT_COST_PER_TOKEN;
+        const outputCost = usage.completionTokens * OUTPUT_COST_PER_TOKEN;
         const totalCost = inputCost + outputCost;
 
         return {
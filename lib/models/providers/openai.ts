@@ -21,6 +21,10 @@ import {
     ModelProviderError
 } from '../types';
 
+// GPT-4o-mini pricing (as of 2024), per token
+const INPUT_COST_PER_TOKEN = 0.00000015; // $0.15 per 1M tokens
+const OUTPUT_COST_PER_TOKEN = 0.0000006; // $0.60 per 1M tokens
+
 export class OpenAIProvider implements AIModelProvider {
     name = 'openai';
     models = [
@@ -179,12 +183,8 @@ export class OpenAIProvider implements AIModelProvider {
     }
 
     calculateCost(usage: ModelResponse['usage']): CostInfo {
-        // GPT-4o-mini pricing (as of 2024)
-        const inputCostPerToken = 0.00000015; // $0.15 per 1M tokens
-        const outputCostPerToken = 0.0000006; // $0.60 per 1M tokens
-
-        const inputCost = usage.promptTokens * inputCostPerToken;
-        const outputCost = usage.completionTokens * outputCostPerToken;
+        const inputCost = usage.promptTokens * INPUT_COST_PER_TOKEN;
+        const outputCost = usage.completionTokens * OUTPUT_COST_PER_TOKEN;
         const totalCost = inputCost + outputCost;
 
         return {
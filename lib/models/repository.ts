@@ -18,15 +18,20 @@ import {
     RateLimitError,
     InsufficientQuotaError
 } from './types';
-import { OpenAIProvider } from './providers/openai';
-import { ClaudeProvider } from './providers/claude';
-import { LocalMockProvider } from './providers/local-mock';
 import { config } from '../../config';
 
+// Provider modules are loaded only for the providers that get configured, so an unused
+// SDK (e.g. the Anthropic client when only OpenAI is set up) is never evaluated
+type OpenAIProviderModule = typeof import('./providers/openai');
+type ClaudeProviderModule = typeof import('./providers/claude');
+type LocalMockProviderModule = typeof import('./providers/local-mock');
+
 export class ModelRepository {
     private static instance: ModelRepository;
     private providers: Map<string, ModelProviderConfig> = new Map();
     private rateLimitTracker: Map<string, { requests: number; lastReset: number }> = new Map();
+    // Enabled providers in priority order, rebuilt only after a provider is added, removed or reconfigured
+    private enabledProvidersCache: readonly AIModelProvider[] | null = null;
 
     private constructor() {
         this.initializeProviders();
@@ -45,6 +50,7 @@ export class ModelRepository {
         // Try to initialize OpenAI Provider
         if (config.hasOpenAI) {
             try {
+                const { OpenAIProvider } = require('./providers/openai') as OpenAIProviderModule;
                 const openaiProvider = new OpenAIProvider();
                 this.providers.set('openai', {
                     provider: openaiProvider,
@@ -71,6 +77,7 @@ export class ModelRepository {
         // Try to initialize Claude Provider
         if (config.hasAnthropic) {
             try {
+                const { ClaudeProvider } = require('./providers/claude') as ClaudeProviderModule;
                 const claudeProvider = new ClaudeProvider();
                 this.providers.set('anthropic', {
                     provider: claudeProvider,
@@ -97,6 +104,7 @@ export class ModelRepository {
         // If no real providers are available, use mock provider
         if (providersInitialized === 0) {
             console.log('🔧 No external API providers available, initializing mock provider for development');
+            const { LocalMockProvider } = require('./providers/local-mock') as LocalMockProviderModule;
             const mockProvider = new LocalMockProvider();
             this.providers.set('local-mock', {
                 provider: mockProvider,
@@ -120,6 +128,7 @@ export class ModelRepository {
      */
     public addProvider(name: string, providerConfig: ModelProviderConfig): void {
         this.providers.set(name, providerConfig);
+        this.enabledProvidersCache = null;
     }
 
     /**
@@ -127,6 +136,7 @@ export class ModelRepository {
      */
     public removeProvider(name: string): void {
         this.providers.delete(name);
+        this.enabledProvidersCache = null;
     }
 
     /**
@@ -140,11 +150,16 @@ export class ModelRepository {
     /**
      * Get all enabled providers
      */
-    public getEnabledProviders(): AIModelProvider[] {
-        return Array.from(this.providers.values())
-            .filter(config => config.enabled)
-            .sort((a, b) => a.priority - b.priority)
-            .map(config => config.provider);
+    public getEnabledProviders(): readonly AIModelProvider[] {
+        if (!this.enabledProvidersCache) {
+            this.enabledProvidersCache = Object.freeze(
+                Array.from(this.providers.values())
+                    .filter(config => config.enabled)
+                    .sort((a, b) => a.priority - b.priority)
+                    .map(config => config.provider)
+            );
+        }
+        return this.enabledProvidersCache;
     }
 
     /**
@@ -358,6 +373,7 @@ export class ModelRepository {
         const config = this.providers.get(name);
         if (config) {
             config.enabled = enabled;
+            this.enabledProvidersCache = null;
         }
     }
 
@@ -368,6 +384,7 @@ export class ModelRepository {
         const config = this.providers.get(name);
         if (config) {
             config.priority = priority;
+            this.enabledProvidersCache = null;
         }
     }
 
@@ -9,6 +9,13 @@ import { PrismaClient } from '@prisma/client';
 import { Session, SessionCategory, SessionStatus, SessionLog, SessionFile, LogSeverity, FileProcessingStatus } from '@prisma/client';
 import { getQdrantService, SearchResult } from '../vector/qdrant-service';
 
+// User fields returned alongside sessions, shared by every session query
+const SESSION_USER_SELECT = {
+    id: true,
+    name: true,
+    email: true,
+} as const;
+
 // Types for better type safety
 export interface SessionCreateInput {
     userId: string;
@@ -100,11 +107,7 @@ export class SessionService {
                 },
                 include: {
                     user: {
-                        select: {
-                            id: true,
-                            name: true,
-                            email: true,
-                        },
+                        select: SESSION_USER_SELECT,
                     },
                 },
             });
@@ -139,11 +142,7 @@ export class SessionService {
                 },
                 include: {
                     user: {
-                        select: {
-                            id: true,
-                            name: true,
-                            email: true,
-                        },
+                        select: SESSION_USER_SELECT,
                     },
                     chats: {
                         orderBy: {
@@ -199,11 +198,7 @@ export class SessionService {
                 },
                 include: {
                     user: {
-                        select: {
-                            id: true,
-                            name: true,
-                            email: true,
-                        },
+                        select: SESSION_USER_SELECT,
                     },
                 },
             });
@@ -289,11 +284,7 @@ export class SessionService {
                     where,
                     include: {
                         user: {
-                            select: {
-                                id: true,
-                                name: true,
-                                email: true,
-                            },
+                            select: SESSION_USER_SELECT,
                         },
                         _count: {
                             select: {
@@ -697,87 +688,54 @@ export class SessionService {
             const startDate = new Date();
             startDate.setDate(startDate.getDate() - days);
 
+            const where = {
+                userId: userId,
+                createdAt: {
+                    gte: startDate,
+                },
+            };
+
+            // Session counters are stored on each row, so one aggregate covers every total;
+            // AVG already ignores sessions without a recorded duration
             const [
-                totalSessions,
+                totals,
                 activeSessions,
-                totalMessages,
-                totalCost,
                 categoryBreakdown,
             ] = await Promise.all([
-                this.prisma.session.count({
-                    where: {
-                        userId: userId,
-                        createdAt: {
-                            gte: startDate,
-                        },
-                    },
-                }),
-                this.prisma.session.count({
-                    where: {
-                        userId: userId,
-                        status: SessionStatus.ACTIVE,
-                        createdAt: {
-                            gte: startDate,
-                        },
-                    },
-                }),
                 this.prisma.session.aggregate({
-                    where: {
-                        userId: userId,
-                        createdAt: {
-                            gte: startDate,
-                        },
+                    where,
+                    _count: {
+                        _all: true,
                     },
                     _sum: {
                         messageCount: true,
+                        totalCost: true,
+                    },
+                    _avg: {
+                        durationMinutes: true,
                     },
                 }),
-                this.prisma.session.aggregate({
+                this.prisma.session.count({
                     where: {
-                        userId: userId,
-                        createdAt: {
-                            gte: startDate,
-                        },
-                    },
-                    _sum: {
-                        totalCost: true,
+                        ...where,
+                        status: SessionStatus.ACTIVE,
                     },
                 }),
                 this.prisma.session.groupBy({
                     by: ['category'],
-                    where: {
-                        userId: userId,
-                        createdAt: {
-                            gte: startDate,
-                        },
-                    },
+                    where,
                     _count: {
                         category: true,
                     },
                 }),
             ]);
 
-            const averageSessionDuration = await this.prisma.session.aggregate({
-                where: {
-                    userId: userId,
-                    createdAt: {
-                        gte: startDate,
-                    },
-                    durationMinutes: {
-                        not: null,
-                    },
-                },
-                _avg: {
-                    durationMinutes: true,
-                },
-            });
-
             return {
-                totalSessions,
+                totalSessions: totals._count._all,
                 activeSessions,
-                totalMessages: totalMessages._sum.messageCount || 0,
-                totalCost: Number(totalCost._sum.totalCost || 0),
-                averageSessionDuration: averageSessionDuration._avg.durationMinutes || 0,
+                totalMessages: totals._sum.messageCount || 0,
+                totalCost: Number(totals._sum.totalCost || 0),
+                averageSessionDuration: totals._avg.durationMinutes || 0,
                 categoryBreakdown: categoryBreakdown.map(item => ({
                     category: item.category,
                     count: item._count.category,
@@ -0,0 +1,84 @@
+/**
+ * Admin Vector Search
+ * Request validation and collection dispatch shared by the admin search routes
+ */
+
+import { z } from 'zod';
+import { getQdrantService, SearchResult, SearchTuning } from './qdrant-service';
+
+// Resolve the shared service once per module instead of on every request
+const qdrant = getQdrantService();
+
+// Bound request size up front so oversized searches are rejected before touching Qdrant
+export const adminSearchRequestSchema = z.object({
+    query: z.string().min(1).max(2048),
+    collection: z.string(),
+    limit: z.number().int().min(1).max(500).default(10),
+    // Optional recall/latency knobs; left unset, Qdrant applies the collection defaults
+    exact: z.boolean().optional(),
+    rescore: z.boolean().optional(),
+    oversampling: z.number().min(1).max(8).optional(),
+    hnswEf: z.number().int().min(1).max(4096).optional()
+});
+
+export type AdminSearchRequest = z.infer<typeof adminSearchRequestSchema>;
+
+// Fixed scope and threshold for dashboard searches, shared across requests
+const ADMIN_USER_ID = 'admin-user';
+const ADMIN_SESSION_ID = 'admin-session';
+const ADMIN_SCORE_THRESHOLD = 0.5;
+
+// Payload keys rendered by the admin dashboard; everything else stays in Qdrant
+const ADMIN_PAYLOAD_FIELDS = ['content', 'title', 'type', 'category', 'source', 'trustScore', 'createdAt'];
+
+type AdminSearcher = (queryVector: number[], limit: number, tuning: SearchTuning) => Promise<SearchResult[]>;
+
+// Collection name to search method, resolved once at module load
+const ADMIN_SEARCHERS = new Map<string, AdminSearcher>([
+    ['knowledge', (queryVector, limit, tuning) => qdrant.searchKnowledge(queryVector, {
+        limit,
+        scoreThreshold: ADMIN_SCORE_THRESHOLD,
+        coalesce: true,
+        payloadFields: ADMIN_PAYLOAD_FIELDS,
+        tuning
+    })],
+    ['sessions', (queryVector, limit, tuning) => qdrant.searchSessions(queryVector, ADMIN_USER_ID, {
+        limit,
+        scoreThreshold: ADMIN_SCORE_THRESHOLD,
+        coalesce: true,
+        payloadFields: ADMIN_PAYLOAD_FIELDS,
+        tuning
+    })],
+    ['documents', (queryVector, limit, tuning) => qdrant.searchDocuments(queryVector, ADMIN_USER_ID, {
+        limit,
+        scoreThreshold: ADMIN_SCORE_THRESHOLD,
+        coalesce: true,
+        payloadFields: ADMIN_PAYLOAD_FIELDS,
+        tuning
+    })],
+    ['files', (queryVector, limit, tuning) => qdrant.searchFiles(queryVector, ADMIN_SESSION_ID, {
+        limit,
+        scoreThreshold: ADMIN_SCORE_THRESHOLD,
+        coalesce: true,
+        payloadFields: ADMIN_PAYLOAD_FIELDS,
+        tuning
+    })]
+]);
+
+/**
+ * Run an admin search against the requested collection
+ * Returns null when the collection name is not recognised
+ */
+export async function runAdminSearch(request: AdminSearchRequest): Promise<SearchResult[] | null> {
+    const search = ADMIN_SEARCHERS.get(request.collection);
+    if (!search) {
+        return null;
+    }
+
+    // Generate a mock embedding for the query
+    // In production, you'd use OpenAI embeddings API
+    const mockEmbedding = Array.from({ length: 1536 }, () => Math.random() - 0.5);
+
+    const { exact, rescore, oversampling, hnswEf } = request;
+    return search(mockEmbedding, request.limit, { exact, rescore, oversampling, hnswEf });
+}
@@ -7,6 +7,7 @@
  */
 
 import { QdrantClient } from '@qdrant/js-client-rest';
+import { config } from '../../config';
 
 // Types for better type safety
 export interface VectorDocument {
@@ -26,10 +27,21 @@ export interface VectorDocument {
     };
 }
 
+// Response-only shapes are readonly so they can be shared (cached, batched, serialized) without defensive copies
 export interface SearchResult {
-    id: string;
-    score: number;
-    payload: VectorDocument['payload'];
+    readonly id: string;
+    readonly score: number;
+    readonly payload: VectorDocument['payload'];
+}
+
+export interface KnowledgePayload {
+    content: string;
+    title: string;
+    category: string;
+    source: string;
+    tags?: string[];
+    trustScore?: number;
+    metadata?: Record<string, any>;
 }
 
 export interface SearchParams {
@@ -41,15 +53,132 @@ export interface SearchParams {
     withVector?: boolean;
 }
 
+// Per-request HNSW/quantization tuning; omitted fields fall back to the collection defaults
+export interface SearchTuning {
+    exact?: boolean;
+    rescore?: boolean;
+    oversampling?: number;
+    // HNSW beam width; defaults to a value scaled with the requested limit
+    hnswEf?: number;
+}
+
 export interface CollectionInfo {
-    name: string;
-    vectorsCount: number;
-    indexedVectorsCount: number;
-    pointsCount: number;
-    segmentsCount: number;
-    status: string;
-    optimizerStatus: string;
-    payloadSchema: Record<string, any>;
+    readonly name: string;
+    readonly vectorsCount: number;
+    readonly indexedVectorsCount: number;
+    readonly pointsCount: number;
+    readonly segmentsCount: number;
+    readonly status: string;
+    readonly optimizerStatus: string;
+    readonly payloadSchema: Record<string, any>;
+}
+
+export class QdrantServiceError extends Error {
+    constructor(message: string, public originalError?: Error) {
+        super(message);
+        this.name = 'QdrantServiceError';
+    }
+}
+
+export class QdrantUnavailableError extends QdrantServiceError {
+    constructor(message: string, originalError?: Error) {
+        super(message, originalError);
+        this.name = 'QdrantUnavailableError';
+    }
+}
+
+// Transport failures and gateway statuses that mean Qdrant itself is unreachable
+const UNAVAILABLE_ERROR_CODES = new Set(['ECONNREFUSED', 'ECONNRESET', 'ETIMEDOUT', 'ENOTFOUND', 'EAI_AGAIN', 'UND_ERR_CONNECT_TIMEOUT']);
+const UNAVAILABLE_STATUSES = new Set([502, 503, 504]);
+
+/**
+ * Wrap a failure in the Qdrant error taxonomy, keeping unavailability distinguishable from request errors
+ */
+function toQdrantError(context: string, error: unknown): QdrantServiceError {
+    const message = `${context}: ${error instanceof Error ? error.message : 'Unknown error'}`;
+    const originalError = error instanceof Error ? error : undefined;
+    const cause = error as { code?: string; status?: number; cause?: { code?: string } } | null;
+    const code = cause?.cause?.code ?? cause?.code;
+
+    if (
+        error instanceof QdrantUnavailableError ||
+        (code !== undefined && UNAVAILABLE_ERROR_CODES.has(code)) ||
+        (cause?.status !== undefined && UNAVAILABLE_STATUSES.has(cause.status))
+    ) {
+        return new QdrantUnavailableError(message, originalError);
+    }
+    return new QdrantServiceError(message, originalError);
+}
+
+// Collection metadata changes rarely, while the admin dashboard polls it every few seconds
+const COLLECTIONS_INFO_TTL_MS = 15_000;
+
+// Full embedding size, used by the global and user-level collections
+const FULL_VECTOR_SIZE = 1536; // OpenAI embedding dimension
+
+// Session-scoped file vectors keep only a leading slice of the embedding; recall within one
+// session's handful of documents barely changes, while storage and distance cost scale with size
+const SESSION_FILE_VECTOR_SIZE = 256;
+
+// Per-request HNSW beam width: max(MIN_HNSW_EF, limit * HNSW_EF_PER_RESULT)
+const MIN_HNSW_EF = 64;
+const HNSW_EF_PER_RESULT = 4;
+
+// Health probes are answered from the last result for a few seconds instead of a round-trip each
+const HEALTH_CHECK_TTL_MS = 5_000;
+
+// Coalesced searches against the same collection are grouped into one batch request
+const SEARCH_BATCH_WINDOW_MS = 5;
+const SEARCH_BATCH_MAX_SIZE = 64;
+
+type SearchRequestBody = Parameters<QdrantClient['search']>[1];
+type ScoredPoints = Awaited<ReturnType<QdrantClient['search']>>;
+
+interface PendingSearch {
+    request: SearchRequestBody;
+    resolve: (points: ScoredPoints) => void;
+    reject: (error: unknown) => void;
+}
+
+/**
+ * Translate search tuning into Qdrant search params
+ * The HNSW beam width follows the limit: small lookups skip needless graph traversal, large ones keep recall
+ */
+function toQdrantSearchParams(limit: number, tuning: SearchTuning = {}): SearchRequestBody['params'] {
+    const { exact, rescore, oversampling, hnswEf } = tuning;
+    const quantization = rescore === undefined && oversampling === undefined
+        ? undefined
+        : { rescore, oversampling };
+
+    return {
+        hnsw_ef: hnswEf ?? Math.max(MIN_HNSW_EF, limit * HNSW_EF_PER_RESULT),
+        exact,
+        quantization
+    };
+}
+
+/**
+ * Truncate an embedding to its leading dimensions and re-normalize it to unit length
+ */
+function truncateVector(vector: number[], size: number): number[] {
+    if (vector.length <= size) {
+        return vector;
+    }
+
+    const truncated = vector.slice(0, size);
+    const norm = Math.sqrt(truncated.reduce((sum, value) => sum + value * value, 0));
+    return norm > 0 ? truncated.map(value => value / norm) : truncated;
+}
+
+/**
+ * Normalize Qdrant scored points into search results, converting numeric IDs to strings in one place
+ */
+function toSearchResults(points: ScoredPoints): SearchResult[] {
+    return points.map(point => ({
+        id: typeof point.id === 'string' ? point.id : String(point.id),
+        score: point.score,
+        payload: point.payload as VectorDocument['payload'],
+    }));
 }
 
 export class QdrantService {
@@ -60,10 +189,19 @@ export class QdrantService {
         knowledge: string;
         files: string;
     };
-
-    constructor(url: string = 'http://localhost:6333') {
+    private collectionsInfoCache: { value: readonly CollectionInfo[]; expiresAt: number } | null = null;
+    private pendingSearches: Map<string, PendingSearch[]> = new Map();
+    private ensuredCollections: Map<string, Promise<void>> = new Map();
+    private vectorSizes: Map<string, number>;
+    private healthStatus: { healthy: boolean; checkedAt: number } | null = null;
+    private pendingHealthCheck: Promise<boolean> | null = null;
+
+    constructor(url: string = config.qdrantUrl) {
+        // The client reuses keep-alive connections through Node's fetch, so one instance serves every request
         this.client = new QdrantClient({
             url,
+            apiKey: config.qdrantApiKey || undefined,
+            timeout: config.qdrantTimeoutMs,
             checkCompatibility: false // Disable version compatibility check
         });
         this.collections = {
@@ -72,6 +210,7 @@ export class QdrantService {
             knowledge: 'knowledge',
             files: 'files',
         };
+        this.vectorSizes = new Map([[this.collections.files, SESSION_FILE_VECTOR_SIZE]]);
     }
 
     /**
@@ -82,12 +221,47 @@ export class QdrantService {
             const collections = Object.values(this.collections);
 
             for (const collectionName of collections) {
-                await this.createCollectionIfNotExists(collectionName);
+                await this.ensureCollection(collectionName);
             }
+            this.invalidateCollectionsInfo();
 
             console.log('✅ Qdrant collections initialized successfully');
         } catch (error) {
-            throw new Error(`Failed to initialize Qdrant collections: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to initialize Qdrant collections', error);
+        }
+    }
+
+    /**
+     * Create a collection on first use, at most once per process
+     */
+    private ensureCollection(collectionName: string): Promise<void> {
+        let ensured = this.ensuredCollections.get(collectionName);
+        if (!ensured) {
+            ensured = this.createCollectionIfNotExists(collectionName).catch((error) => {
+                // Allow a later call to retry
+                this.ensuredCollections.delete(collectionName);
+                throw error;
+            });
+            this.ensuredCollections.set(collectionName, ensured);
+        }
+        return ensured;
+    }
+
+    /**
+     * Vector size for a collection
+     */
+    private getVectorSize(collectionName: string): number {
+        return this.vectorSizes.get(collectionName) ?? FULL_VECTOR_SIZE;
+    }
+
+    /**
+     * Adopt the vector size of an existing collection, so collections created before a size change keep working
+     */
+    private async syncVectorSize(collectionName: string): Promise<void> {
+        const info = await this.client.getCollection(collectionName);
+        const vectors = info.config?.params?.vectors as { size?: number } | undefined;
+        if (typeof vectors?.size === 'number') {
+            this.vectorSizes.set(collectionName, vectors.size);
         }
     }
 
@@ -96,73 +270,71 @@ export class QdrantService {
      */
     private async createCollectionIfNotExists(collectionName: string): Promise<void> {
         try {
-            let exists = false;
+            // Attempt the create directly; Qdrant rejects duplicates, which saves an existence probe round-trip
             try {
-                const result = await this.client.collectionExists(collectionName);
-                exists = result.exists || false;
-            } catch (error) {
-                // If collection doesn't exist, collectionExists throws an error
-                exists = false;
-            }
-
-            if (!exists) {
-                try {
-                    await this.client.createCollection(collectionName, {
-                        vectors: {
-                            size: 1536, // OpenAI embedding dimension
-                            distance: 'Cosine', // Best for semantic similarity
-                        },
-                        optimizers_config: {
-                            default_segment_number: 2,
+                await this.client.createCollection(collectionName, {
+                    vectors: {
+                        size: this.getVectorSize(collectionName),
+                        distance: 'Cosine', // Best for semantic similarity
+                    },
+                    optimizers_config: {
+                        default_segment_number: 2,
+                    },
+                    // int8 copies of the vectors stay in RAM for the HNSW traversal; originals are used to rescore
+                    quantization_config: {
+                        scalar: {
+                            type: 'int8',
+                            quantile: 0.99,
+                            always_ram: true,
                         },
-                        replication_factor: 1,
-                    });
-                } catch (createError: any) {
-                    // If collection already exists, that's fine
-                    if (createError.message?.includes('Bad Request') || createError.status === 400) {
-                        console.log(`✅ Collection '${collectionName}' already exists`);
-                        return;
-                    }
-                    throw createError;
+                    },
+                    replication_factor: 1,
+                });
+            } catch (createError: any) {
+                // If collection already exists, that's fine
+                if (createError.message?.includes('Bad Request') || createError.status === 400 || createError.status === 409) {
+                    console.log(`✅ Collection '${collectionName}' already exists`);
+                    await this.syncVectorSize(collectionName);
+                    return;
                 }
+                throw createError;
+            }
 
-                // Create payload index for better filtering performance
-                try {
-                    await this.client.createPayloadIndex(collectionName, {
-                        field_name: 'type',
-                        field_schema: 'keyword',
-                    });
-
-                    await this.client.createPayloadIndex(collectionName, {
-                        field_name: 'userId',
-                        field_schema: 'keyword',
-                    });
-
-                    await this.client.createPayloadIndex(collectionName, {
-                        field_name: 'sessionId',
-                        field_schema: 'keyword',
-                    });
-
-                    await this.client.createPayloadIndex(collectionName, {
-                        field_name: 'category',
-                        field_schema: 'keyword',
-                    });
-
-                    await this.client.createPayloadIndex(collectionName, {
-                        field_name: 'tags',
-                        field_schema: 'keyword',
-                    });
-                } catch (indexError) {
-                    // Indexes might already exist, continue
-                    console.log(`⚠️  Some indexes for '${collectionName}' may already exist`);
-                }
+            // Create payload index for better filtering performance
+            try {
+                await this.client.createPayloadIndex(collectionName, {
+                    field_name: 'type',
+                    field_schema: 'keyword',
+                });
+
+                await this.client.createPayloadIndex(collectionName, {
+                    field_name: 'userId',
+                    field_schema: 'keyword',
+                });
 
-                console.log(`✅ Collection '${collectionName}' created with indexes`);
-            } else {
-                console.log(`✅ Collection '${collectionName}' already exists`);
+                await this.client.createPayloadIndex(collectionName, {
+                    field_name: 'sessionId',
+                    field_schema: 'keyword',
+                });
+
+                await this.client.createPayloadIndex(collectionName, {
+                    field_name: 'category',
+                    field_schema: 'keyword',
+                });
+
+                await this.client.createPayloadIndex(collectionName, {
+                    field_name: 'tags',
+                    field_schema: 'keyword',
+                });
+            } catch (indexError) {
+                // Indexes might already exist, continue
+                console.log(`⚠️  Some indexes for '${collectionName}' may already exist`);
             }
+
+            this.invalidateCollectionsInfo();
+            console.log(`✅ Collection '${collectionName}' created with indexes`);
         } catch (error) {
-            throw new Error(`Failed to create collection ${collectionName}: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError(`Failed to create collection ${collectionName}`, error);
         }
     }
 
@@ -194,12 +366,13 @@ export class QdrantService {
                 },
             };
 
+            await this.ensureCollection(this.collections.sessions);
             await this.client.upsert(this.collections.sessions, {
                 wait: true,
                 points: [document],
             });
         } catch (error) {
-            throw new Error(`Failed to store session vector: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to store session vector', error);
         }
     }
 
@@ -230,12 +403,13 @@ export class QdrantService {
                 },
             };
 
+            await this.ensureCollection(this.collections.documents);
             await this.client.upsert(this.collections.documents, {
                 wait: true,
                 points: [document],
             });
         } catch (error) {
-            throw new Error(`Failed to store document vector: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to store document vector', error);
         }
     }
 
@@ -245,34 +419,39 @@ export class QdrantService {
     async storeKnowledgeVector(
         knowledgeId: string,
         vector: number[],
-        payload: {
-            content: string;
-            title: string;
-            category: string;
-            source: string;
-            tags?: string[];
-            trustScore?: number;
-            metadata?: Record<string, any>;
-        }
+        payload: KnowledgePayload
+    ): Promise<void> {
+        await this.storeKnowledgeVectors([{ id: knowledgeId, vector, payload }]);
+    }
+
+    /**
+     * Store several knowledge vectors in a single upsert
+     */
+    async storeKnowledgeVectors(
+        entries: Array<{ id: string; vector: number[]; payload: KnowledgePayload }>
     ): Promise<void> {
+        if (entries.length === 0) return;
+
         try {
-            const document: VectorDocument = {
-                id: knowledgeId,
+            const timestamp = new Date().toISOString();
+            const points: VectorDocument[] = entries.map(({ id, vector, payload }) => ({
+                id,
                 vector,
                 payload: {
                     ...payload,
                     type: 'knowledge',
-                    createdAt: new Date().toISOString(),
-                    updatedAt: new Date().toISOString(),
+                    createdAt: timestamp,
+                    updatedAt: timestamp,
                 },
-            };
+            }));
 
+            await this.ensureCollection(this.collections.knowledge);
             await this.client.upsert(this.collections.knowledge, {
                 wait: true,
-                points: [document],
+                points,
             });
         } catch (error) {
-            throw new Error(`Failed to store knowledge vector: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to store knowledge vector', error);
         }
     }
 
@@ -293,9 +472,11 @@ export class QdrantService {
         }
     ): Promise<void> {
         try {
+            await this.ensureCollection(this.collections.files);
+
             const document: VectorDocument = {
                 id: fileId,
-                vector,
+                vector: truncateVector(vector, this.getVectorSize(this.collections.files)),
                 payload: {
                     ...payload,
                     type: 'file',
@@ -309,7 +490,7 @@ export class QdrantService {
                 points: [document],
             });
         } catch (error) {
-            throw new Error(`Failed to store file vector: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to store file vector', error);
         }
     }
 
@@ -324,6 +505,9 @@ export class QdrantService {
             scoreThreshold?: number;
             category?: string;
             tags?: string[];
+            coalesce?: boolean;
+            payloadFields?: string[];
+            tuning?: SearchTuning;
         } = {}
     ): Promise<SearchResult[]> {
         try {
@@ -332,6 +516,9 @@ export class QdrantService {
                 scoreThreshold = 0.7,
                 category,
                 tags = [],
+                coalesce = false,
+                payloadFields,
+                tuning,
             } = params;
 
             const filter: Record<string, any> = {
@@ -361,22 +548,20 @@ export class QdrantService {
                 });
             }
 
-            const searchResult = await this.client.search(this.collections.sessions, {
+            const searchResult = await this.runSearch(this.collections.sessions, {
                 vector: queryVector,
                 limit,
                 score_threshold: scoreThreshold,
                 filter,
-                with_payload: true,
+                // Only transfer the requested payload keys when the caller names them
+                with_payload: payloadFields ?? true,
                 with_vector: false,
-            });
+                params: toQdrantSearchParams(limit, tuning),
+            }, coalesce);
 
-            return searchResult.map((result: any) => ({
-                id: result.id as string,
-                score: result.score,
-                payload: result.payload as VectorDocument['payload'],
-            }));
+            return toSearchResults(searchResult);
         } catch (error) {
-            throw new Error(`Failed to search sessions: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to search sessions', error);
         }
     }
 
@@ -391,6 +576,9 @@ export class QdrantService {
             scoreThreshold?: number;
             category?: string;
             tags?: string[];
+            coalesce?: boolean;
+            payloadFields?: string[];
+            tuning?: SearchTuning;
         } = {}
     ): Promise<SearchResult[]> {
         try {
@@ -399,6 +587,9 @@ export class QdrantService {
                 scoreThreshold = 0.7,
                 category,
                 tags = [],
+                coalesce = false,
+                payloadFields,
+                tuning,
             } = params;
 
             const filter: Record<string, any> = {
@@ -428,22 +619,20 @@ export class QdrantService {
                 });
             }
 
-            const searchResult = await this.client.search(this.collections.documents, {
+            const searchResult = await this.runSearch(this.collections.documents, {
                 vector: queryVector,
                 limit,
                 score_threshold: scoreThreshold,
                 filter,
-                with_payload: true,
+                // Only transfer the requested payload keys when the caller names them
+                with_payload: payloadFields ?? true,
                 with_vector: false,
-            });
+                params: toQdrantSearchParams(limit, tuning),
+            }, coalesce);
 
-            return searchResult.map((result: any) => ({
-                id: result.id as string,
-                score: result.score,
-                payload: result.payload as VectorDocument['payload'],
-            }));
+            return toSearchResults(searchResult);
         } catch (error) {
-            throw new Error(`Failed to search documents: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to search documents', error);
         }
     }
 
@@ -458,6 +647,9 @@ export class QdrantService {
             category?: string;
             tags?: string[];
             minTrustScore?: number;
+            coalesce?: boolean;
+            payloadFields?: string[];
+            tuning?: SearchTuning;
         } = {}
     ): Promise<SearchResult[]> {
         try {
@@ -467,6 +659,9 @@ export class QdrantService {
                 category,
                 tags = [],
                 minTrustScore = 0.5,
+                coalesce = false,
+                payloadFields,
+                tuning,
             } = params;
 
             const filter: Record<string, any> = {
@@ -501,22 +696,20 @@ export class QdrantService {
                 });
             }
 
-            const searchResult = await this.client.search(this.collections.knowledge, {
+            const searchResult = await this.runSearch(this.collections.knowledge, {
                 vector: queryVector,
                 limit,
                 score_threshold: scoreThreshold,
                 filter,
-                with_payload: true,
+                // Only transfer the requested payload keys when the caller names them
+                with_payload: payloadFields ?? true,
                 with_vector: false,
-            });
+                params: toQdrantSearchParams(limit, tuning),
+            }, coalesce);
 
-            return searchResult.map((result: any) => ({
-                id: result.id as string,
-                score: result.score,
-                payload: result.payload as VectorDocument['payload'],
-            }));
+            return toSearchResults(searchResult);
         } catch (error) {
-            throw new Error(`Failed to search knowledge: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to search knowledge', error);
         }
     }
 
@@ -531,6 +724,9 @@ export class QdrantService {
             scoreThreshold?: number;
             fileType?: string;
             tags?: string[];
+            coalesce?: boolean;
+            payloadFields?: string[];
+            tuning?: SearchTuning;
         } = {}
     ): Promise<SearchResult[]> {
         try {
@@ -539,6 +735,9 @@ export class QdrantService {
                 scoreThreshold = 0.7,
                 fileType,
                 tags = [],
+                coalesce = false,
+                payloadFields,
+                tuning,
             } = params;
 
             const filter: Record<string, any> = {
@@ -568,22 +767,70 @@ export class QdrantService {
                 });
             }
 
-            const searchResult = await this.client.search(this.collections.files, {
-                vector: queryVector,
+            // Resolve the collection's vector size (an existing collection may predate truncation)
+            await this.ensureCollection(this.collections.files);
+
+            const searchResult = await this.runSearch(this.collections.files, {
+                vector: truncateVector(queryVector, this.getVectorSize(this.collections.files)),
                 limit,
                 score_threshold: scoreThreshold,
                 filter,
-                with_payload: true,
+                // Only transfer the requested payload keys when the caller names them
+                with_payload: payloadFields ?? true,
                 with_vector: false,
-            });
+                params: toQdrantSearchParams(limit, tuning),
+            }, coalesce);
 
-            return searchResult.map((result: any) => ({
-                id: result.id as string,
-                score: result.score,
-                payload: result.payload as VectorDocument['payload'],
-            }));
+            return toSearchResults(searchResult);
+        } catch (error) {
+            throw toQdrantError('Failed to search files', error);
+        }
+    }
+
+    /**
+     * Run a search, optionally coalescing it with concurrent searches on the same collection
+     */
+    private runSearch(collectionName: string, request: SearchRequestBody, coalesce: boolean): Promise<ScoredPoints> {
+        if (!coalesce) {
+            return this.client.search(collectionName, request);
+        }
+
+        return new Promise((resolve, reject) => {
+            let pending = this.pendingSearches.get(collectionName);
+            if (!pending) {
+                pending = [];
+                this.pendingSearches.set(collectionName, pending);
+                setTimeout(() => this.flushSearches(collectionName), SEARCH_BATCH_WINDOW_MS);
+            }
+
+            pending.push({ request, resolve, reject });
+
+            if (pending.length >= SEARCH_BATCH_MAX_SIZE) {
+                this.flushSearches(collectionName);
+            }
+        });
+    }
+
+    /**
+     * Send all pending searches for a collection as a single batch request
+     */
+    private async flushSearches(collectionName: string): Promise<void> {
+        const pending = this.pendingSearches.get(collectionName);
+        if (!pending) return;
+        this.pendingSearches.delete(collectionName);
+
+        try {
+            if (pending.length === 1) {
+                pending[0].resolve(await this.client.search(collectionName, pending[0].request));
+                return;
+            }
+
+            const results = await this.client.searchBatch(collectionName, {
+                searches: pending.map(search => search.request),
+            });
+            pending.forEach((search, index) => search.resolve(results[index] || []));
         } catch (error) {
-            throw new Error(`Failed to search files: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            pending.forEach(search => search.reject(error));
         }
     }
 
@@ -597,7 +844,7 @@ export class QdrantService {
                 points: [id],
             });
         } catch (error) {
-            throw new Error(`Failed to delete vector: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to delete vector', error);
         }
     }
 
@@ -616,7 +863,7 @@ export class QdrantService {
                 points: [id],
             });
         } catch (error) {
-            throw new Error(`Failed to update vector payload: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to update vector payload', error);
         }
     }
 
@@ -637,39 +884,94 @@ export class QdrantService {
                 payloadSchema: info.payload_schema,
             };
         } catch (error) {
-            throw new Error(`Failed to get collection info: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to get collection info', error);
         }
     }
 
     /**
-     * Get all collections info
+     * Get info for every collection, in response-ready list form
      */
-    async getAllCollectionsInfo(): Promise<Record<string, CollectionInfo>> {
+    async listCollectionsInfo(): Promise<readonly CollectionInfo[]> {
+        if (this.collectionsInfoCache && this.collectionsInfoCache.expiresAt > Date.now()) {
+            return this.collectionsInfoCache.value;
+        }
+
         try {
             const collections = Object.keys(this.collections) as Array<keyof typeof this.collections>;
-            const info: Record<string, CollectionInfo> = {};
-
-            for (const collection of collections) {
-                info[collection] = await this.getCollectionInfo(collection);
-            }
+            // Fetch all collections concurrently so latency is one round-trip rather than one per collection
+            const info = await Promise.all(collections.map(collection => this.getCollectionInfo(collection)));
 
+            this.collectionsInfoCache = { value: info, expiresAt: Date.now() + COLLECTIONS_INFO_TTL_MS };
             return info;
         } catch (error) {
-            throw new Error(`Failed to get all collections info: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to get all collections info', error);
         }
     }
 
+    /**
+     * Get all collections info keyed by collection name
+     */
+    async getAllCollectionsInfo(): Promise<Record<string, CollectionInfo>> {
+        const info = await this.listCollectionsInfo();
+        return Object.fromEntries(info.map(collection => [collection.name, collection]));
+    }
+
     /**
      * Health check
+     * Reuses a recent result, and concurrent callers share a single probe
      */
     async healthCheck(): Promise<boolean> {
+        if (this.healthStatus && Date.now() - this.healthStatus.checkedAt < HEALTH_CHECK_TTL_MS) {
+            return this.healthStatus.healthy;
+        }
+
+        if (!this.pendingHealthCheck) {
+            this.pendingHealthCheck = this.probeHealth().finally(() => {
+                this.pendingHealthCheck = null;
+            });
+        }
+        return this.pendingHealthCheck;
+    }
+
+    /**
+     * Last known health status without touching Qdrant; null until the first check completes
+     */
+    get isHealthy(): boolean | null {
+        return this.healthStatus ? this.healthStatus.healthy : null;
+    }
+
+    /**
+     * Probe Qdrant and record the result
+     */
+    private async probeHealth(): Promise<boolean> {
+        let healthy: boolean;
         try {
             // Use getCollections as a health check since healthCheck method doesn't exist
             await this.client.getCollections();
-            return true;
+            healthy = true;
         } catch (error) {
-            return false;
+            healthy = false;
         }
+
+        this.healthStatus = { healthy, checkedAt: Date.now() };
+        return healthy;
+    }
+
+    /**
+     * Open the client connection and prime the collection cache ahead of the first request
+     */
+    async warmup(): Promise<void> {
+        const isHealthy = await this.healthCheck();
+        if (isHealthy) {
+            await this.listCollectionsInfo().catch(() => undefined);
+        }
+    }
+
+    /**
+     * Drop cached collection statistics so the next read hits Qdrant
+     */
+    invalidateCollectionsInfo(): void {
+        this.collectionsInfoCache = null;
     }
 
     /**
@@ -682,8 +984,9 @@ export class QdrantService {
                 wait: true,
                 points: [], // Empty array means delete all
             });
+            this.invalidateCollectionsInfo();
         } catch (error) {
-            throw new Error(`Failed to clear collection: ${error instanceof Error ? error.message : 'Unknown error'}`);
+            throw toQdrantError('Failed to clear collection', error);
         }
     }
 }
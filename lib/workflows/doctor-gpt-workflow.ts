@@ -13,6 +13,7 @@ import { modelRepository } from '../models/repository';
 import { tavilySearch } from '../search/tavily';
 import { costTracker } from '../cost-tracking/tracker';
 import { Operation } from '../cost-tracking/types';
+import { config } from '../../config';
 import {
     DoctorGPTState,
     WorkflowNode,
@@ -35,6 +36,22 @@ import {
 } from './types';
 import { MedicalResponse, Citation } from '../models/types';
 
+// Fixed instruction that opens every reasoning prompt; kept byte-identical so providers can reuse the cached prefix
+const MEDICAL_SYSTEM_PROMPT = 'You are a medical AI assistant. Provide accurate, evidence-based information.';
+
+// Per-node trace lines and full prompt/context dumps are development-only; read once here rather than
+// on every workflow run, so production skips writing and formatting them
+const VERBOSE_WORKFLOW_LOGS = config.isDevelopment;
+
+/**
+ * Log a development-only workflow trace line
+ */
+function traceWorkflow(message: string): void {
+    if (VERBOSE_WORKFLOW_LOGS) {
+        console.log(message);
+    }
+}
+
 // Define the state annotation for LangGraph
 const StateAnnotation = Annotation.Root({
     userQuery: Annotation<string>,
@@ -157,7 +174,7 @@ export class DoctorGPTWorkflow {
      * Analyzes user query to determine intent, extract entities, and plan execution
      */
     private async queryAnalysisNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing query analysis node');
+        traceWorkflow('Executing query analysis node');
 
         try {
             const input: QueryAnalysisInput = {
@@ -207,7 +224,7 @@ export class DoctorGPTWorkflow {
      * Retrieves relevant documents from vector database and uploaded documents
      */
     private async documentRetrievalNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing document retrieval node');
+        traceWorkflow('Executing document retrieval node');
 
         try {
             if (!state.processedQuery) {
@@ -218,7 +235,7 @@ export class DoctorGPTWorkflow {
 
             // First, check if there are uploaded documents to use
             if (state.uploadedDocuments && state.uploadedDocuments.length > 0) {
-                console.log(`Using ${state.uploadedDocuments.length} uploaded documents`);
+                traceWorkflow(`Using ${state.uploadedDocuments.length} uploaded documents`);
                 retrievedDocuments = state.uploadedDocuments.map(doc => ({
                     id: doc.id,
                     fileName: doc.fileName,
@@ -233,7 +250,7 @@ export class DoctorGPTWorkflow {
                 }));
             } else {
                 // Fallback to vector search if no uploaded documents
-                console.log('No uploaded documents, performing vector search');
+                traceWorkflow('No uploaded documents, performing vector search');
                 retrievedDocuments = await this.performVectorSearch(
                     state.processedQuery.enhancedQuery,
                     state.userId
@@ -266,7 +283,7 @@ export class DoctorGPTWorkflow {
      * Searches for relevant medical information using Tavily
      */
     private async webSearchNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing web search node');
+        traceWorkflow('Executing web search node');
 
         try {
             if (!state.processedQuery) {
@@ -318,7 +335,7 @@ export class DoctorGPTWorkflow {
      * Gets responses from multiple AI providers and merges them
      */
     private async multiModelReasoningNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing multi-model reasoning node');
+        traceWorkflow('Executing multi-model reasoning node');
 
         try {
             if (!state.processedQuery) {
@@ -327,15 +344,19 @@ export class DoctorGPTWorkflow {
 
             // Prepare context for models
             const context = this.prepareModelContext(state);
-            console.log('Multi-model reasoning context:', context);
-            console.log('Retrieved documents:', state.retrievedDocuments);
+            if (VERBOSE_WORKFLOW_LOGS) {
+                console.log('Multi-model reasoning context:', context);
+                console.log('Retrieved documents:', state.retrievedDocuments);
+            }
 
             // Get responses from multiple models
             const systemMessage = context
-                ? `You are a medical AI assistant. Provide accurate, evidence-based information.\n\nContext from uploaded documents:\n${context}`
-                : 'You are a medical AI assistant. Provide accurate, evidence-based information.';
+                ? `${MEDICAL_SYSTEM_PROMPT}\n\nContext from uploaded documents:\n${context}`
+                : MEDICAL_SYSTEM_PROMPT;
 
-            console.log('System message for AI:', systemMessage);
+            if (VERBOSE_WORKFLOW_LOGS) {
+                console.log('System message for AI:', systemMessage);
+            }
 
             const multiModelResult = await modelRepository.multiModelReasoning(
                 [
@@ -391,7 +412,7 @@ export class DoctorGPTWorkflow {
      * Validates the response for medical accuracy and safety
      */
     private async responseValidationNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing response validation node');
+        traceWorkflow('Executing response validation node');
 
         try {
             if (!state.finalResponse || !state.modelResponses) {
@@ -442,7 +463,7 @@ export class DoctorGPTWorkflow {
      * Enhances citations with additional metadata and verification
      */
     private async citationEnhancementNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing citation enhancement node');
+        traceWorkflow('Executing citation enhancement node');
 
         try {
             const enhancedCitations = await this.enhanceCitations(state.citations || []);
@@ -480,7 +501,7 @@ export class DoctorGPTWorkflow {
      * Final quality assessment of the response
      */
     private async qualityCheckNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing quality check node');
+        traceWorkflow('Executing quality check node');
 
         try {
             const qualityScore = this.calculateQualityScore(state);
@@ -517,7 +538,7 @@ export class DoctorGPTWorkflow {
      * Final cost tracking and budget validation
      */
     private async costTrackingNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing cost tracking node');
+        traceWorkflow('Executing cost tracking node');
 
         try {
             // Aggregate all costs from the workflow
@@ -570,7 +591,7 @@ export class DoctorGPTWorkflow {
      * Handles workflow errors and provides fallback responses
      */
     private async errorHandlerNode(state: DoctorGPTState): Promise<Partial<DoctorGPTState>> {
-        console.log('Executing error handler node');
+        traceWorkflow('Executing error handler node');
 
         try {
             const errorSummary = this.summarizeErrors(state.errors || []);
@@ -710,12 +731,22 @@ export class DoctorGPTWorkflow {
         return [];
     }
 
+    /**
+     * Build the model context, most stable content first
+     * Uploaded documents are ordered by id so the same session yields the same prompt prefix on every turn;
+     * query-dependent retrieval and web results follow so they only affect the prompt suffix
+     */
     private prepareModelContext(state: DoctorGPTState): string {
         let context = '';
 
         if (state.retrievedDocuments?.length) {
+            const uploaded = state.retrievedDocuments
+                .filter(doc => doc.source === 'uploaded')
+                .sort((a, b) => String(a.id).localeCompare(String(b.id)));
+            const retrieved = state.retrievedDocuments.filter(doc => doc.source !== 'uploaded');
+
             context += 'Retrieved documents:\n';
-            state.retrievedDocuments.forEach((doc, i) => {
+            [...uploaded, ...retrieved].forEach((doc, i) => {
                 const content = doc.content || doc.payload?.content || 'No content available';
                 context += `${i + 1}. ${content.substring(0, 200)}...\n`;
             });
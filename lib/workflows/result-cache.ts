@@ -0,0 +1,84 @@
+/**
+ * Workflow Result Cache
+ * In-process LRU cache of Doctor GPT workflow results, so repeated questions
+ * skip retrieval and multi-model reasoning entirely
+ */
+
+import { createHash } from 'crypto';
+import { DoctorGPTState } from './types';
+import { MedicalContext } from '../models/types';
+
+const RESULT_CACHE_MAX_ENTRIES = 500;
+const RESULT_CACHE_TTL_MS = 10 * 60 * 1000;
+
+export interface ResultCacheKeyInput {
+    query: string;
+    userId: string;
+    documents?: Array<{ id: string; content?: string }>;
+    medicalContext?: MedicalContext;
+}
+
+export class WorkflowResultCache {
+    // Map iteration order doubles as recency order: oldest entry first
+    private entries: Map<string, { value: DoctorGPTState; expiresAt: number }> = new Map();
+
+    constructor(
+        private maxEntries: number = RESULT_CACHE_MAX_ENTRIES,
+        private ttlMs: number = RESULT_CACHE_TTL_MS
+    ) { }
+
+    /**
+     * Build a cache key from the inputs that shape the workflow answer
+     * Queries are normalized so trivially different phrasings (case, spacing, trailing punctuation) share an entry;
+     * entries are per user, and documents are keyed by a hash of their resolved text so edited content misses
+     */
+    static key({ query, userId, documents = [], medicalContext }: ResultCacheKeyInput): string {
+        const normalizedQuery = query.toLowerCase().replace(/\s+/g, ' ').replace(/[\s?.!]+$/, '').trim();
+        const documentKeys = documents
+            .map(doc => `${doc.id}:${createHash('sha256').update(doc.content ?? '').digest('hex')}`)
+            .sort()
+            .join(',');
+        return `${userId}\u0000${normalizedQuery}\u0000${documentKeys}\u0000${JSON.stringify(medicalContext ?? null)}`;
+    }
+
+    /**
+     * Get a cached result, refreshing its recency
+     */
+    get(key: string): DoctorGPTState | undefined {
+        const entry = this.entries.get(key);
+        if (!entry) return undefined;
+
+        this.entries.delete(key);
+        if (entry.expiresAt <= Date.now()) {
+            return undefined;
+        }
+
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    /**
+     * Store a result, evicting the least recently used entry when full
+     */
+    set(key: string, value: DoctorGPTState): void {
+        this.entries.delete(key);
+        this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+
+        if (this.entries.size > this.maxEntries) {
+            const oldestKey = this.entries.keys().next().value;
+            if (oldestKey !== undefined) {
+                this.entries.delete(oldestKey);
+            }
+        }
+    }
+
+    /**
+     * Drop all cached results
+     */
+    clear(): void {
+        this.entries.clear();
+    }
+}
+
+// Export singleton instance
+export const workflowResultCache = new WorkflowResultCache();
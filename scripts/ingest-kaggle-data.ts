@@ -6,7 +6,8 @@
  */
 
 import { PrismaClient } from '@prisma/client';
-import { getMedicalDataService, MedicalDocument, MedicalCategory, MedicalSpecialty } from '../lib/medical/medical-data-service';
+import { getMedicalDataService } from '../lib/medical/medical-data-service';
+import { MedicalDocument, MedicalCategory, MedicalSpecialty } from '../lib/medical/types';
 import { getQdrantService } from '../lib/vector/qdrant-service';
 import * as fs from 'fs';
 import * as path from 'path';
@@ -10,10 +10,11 @@
 import { PrismaClient } from '@prisma/client';
 import { getQdrantService } from '../lib/vector/qdrant-service';
 
-async function initializePostgreSQL() {
-    console.log('🔄 Initializing PostgreSQL database...');
+// One client for the whole run so every step reuses the same connection pool
+const sharedPrisma = new PrismaClient();
 
-    const prisma = new PrismaClient();
+async function initializePostgreSQL(prisma: PrismaClient = sharedPrisma) {
+    console.log('🔄 Initializing PostgreSQL database...');
 
     try {
         // Test database connection
@@ -36,8 +37,6 @@ async function initializePostgreSQL() {
     } catch (error) {
         console.error('❌ PostgreSQL initialization failed:', error);
         throw error;
-    } finally {
-        await prisma.$disconnect();
     }
 }
 
@@ -72,10 +71,9 @@ async function initializeQdrant() {
     }
 }
 
-async function createSampleData() {
+async function createSampleData(prisma: PrismaClient = sharedPrisma) {
     console.log('🔄 Creating sample data...');
 
-    const prisma = new PrismaClient();
     const qdrant = getQdrantService();
 
     try {
@@ -147,15 +145,12 @@ async function createSampleData() {
     } catch (error) {
         console.error('❌ Sample data creation failed:', error);
         throw error;
-    } finally {
-        await prisma.$disconnect();
     }
 }
 
-async function runHealthChecks() {
+async function runHealthChecks(prisma: PrismaClient = sharedPrisma) {
     console.log('🔄 Running health checks...');
 
-    const prisma = new PrismaClient();
     const qdrant = getQdrantService();
 
     try {
@@ -182,8 +177,6 @@ async function runHealthChecks() {
     } catch (error) {
         console.error('❌ Health check failed:', error);
         throw error;
-    } finally {
-        await prisma.$disconnect();
     }
 }
 
@@ -218,8 +211,11 @@ async function main() {
 
     } catch (error) {
         console.error('💥 Database initialization failed:', error);
+        await sharedPrisma.$disconnect();
         process.exit(1);
     }
+
+    await sharedPrisma.$disconnect();
 }
 
 // Run if called directly